@@ -5,6 +5,7 @@ Providers router - provider detection for email addresses (Nylas POST /v3/provid
 import logging
 import uuid
 
+import dns.asyncresolver
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.api.middlewares.authentication import get_current_app
@@ -24,8 +25,6 @@ MICROSOFT_DOMAINS = {"outlook.com", "hotmail.com", "live.com", "msn.com"}
 
 async def _detect_provider_via_mx(domain: str) -> str | None:
     try:
-        import dns.asyncresolver
-
         resolver = dns.asyncresolver.Resolver()
         resolver.lifetime = 5
         answers = await resolver.resolve(domain, "MX")
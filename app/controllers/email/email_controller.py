@@ -22,8 +22,10 @@ class EmailController:
         self._message_controller = message_controller
         self._smtp_controller = smtp_controller
 
-    async def get_message_by_id(self, account: Account, message_id: str) -> MessageResult | None:
-        """Get message by id."""
+    async def get_message_by_id(
+        self, account: Account, message_id: str, include_body: bool = True
+    ) -> MessageResult | None:
+        """Get message by id, optionally fetching only its headers when the body isn't needed."""
         email = await self._email_repo.get_by_account_and_email_id(account.id, message_id)
         folder = email.folder if email else None
         uid = email.uid if email else None
@@ -32,7 +34,9 @@ class EmailController:
                 f"Found email metadata; account_id: {account.id}, folder: {folder}, uid: {uid}, email_id: {message_id}"
             )
 
-        message_result = await self._message_controller.get_message_by_id(account, message_id, folder, uid)
+        message_result = await self._message_controller.get_message_by_id(
+            account, message_id, folder, uid, include_body=include_body
+        )
         if message_result is None:
             return None
 
@@ -55,6 +59,10 @@ class EmailController:
 
         return message_result
 
+    def invalidate_cached_messages(self, account: Account) -> None:
+        """Forget the account's cached messages so the next lookups see their current state on the server."""
+        self._message_controller.invalidate_account_messages(account)
+
     async def send_email(
         self,
         account: Account,
@@ -70,8 +78,8 @@ class EmailController:
     ) -> SendMessageResult:
         replied_message_result: MessageResult | None = None
         if reply_to_message_id:
-            # Check if the original message exists
-            replied_message_result = await self.get_message_by_id(account, reply_to_message_id)
+            # Check if the original message exists; threading the reply only needs its headers.
+            replied_message_result = await self.get_message_by_id(account, reply_to_message_id, include_body=False)
             if not replied_message_result:
                 raise SMTPInvalidParameterError("reply_to_message_id", reply_to_message_id)
 
@@ -1,8 +1,11 @@
 import asyncio
 import logging
 import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncGenerator
 
-from aioimaplib import IMAP4_SSL
+from aioimaplib import IMAP4_SSL, Response
 
 from app.models import Account
 from app.utils.password import PasswordUtils
@@ -10,6 +13,9 @@ from settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Pooled connections idle longer than this (seconds) get a NOOP before reuse when no folder SELECT would vet them.
+CONNECTION_NOOP_AFTER = 60
+
 
 class RateLimiter:
     """Token bucket rate limiter for IMAP connections."""
@@ -42,6 +48,12 @@ class RateLimiter:
             self._tokens = 0
 
 
+@dataclass
+class _IdleConnection:
+    connection: IMAP4_SSL
+    released_at: float
+
+
 class ConnectionManager:
     """Manages IMAP connections with pooling and rate limiting."""
 
@@ -50,6 +62,8 @@ class ConnectionManager:
         self._rate_limiters: dict[str, RateLimiter] = {}
         self._connection_locks: dict[str, asyncio.Semaphore] = {}
         self._lock = asyncio.Lock()
+        # Authenticated connections kept warm per account email, most recently released last.
+        self._idle_connections: dict[str, list[_IdleConnection]] = {}
 
         # Simple connection limit per provider
         self._connection_limit = 10
@@ -61,6 +75,82 @@ class ConnectionManager:
             self._connection_locks[imap_host] = asyncio.Semaphore(self._connection_limit)
             self._rate_limiters[imap_host] = RateLimiter(rate=self._connection_limit - 1, burst=self._connection_limit)
 
+    async def acquire_connection(self, account: Account, folder: str | None = None) -> IMAP4_SSL:
+        """
+        Get an authenticated IMAP connection for the account, reusing a pooled one when available.
+
+        Reuse skips the TCP/TLS handshake and LOGIN. Hand the connection back with `release_connection` when done, or
+        `close_connection` it if a command failed and its state is unknown (`pooled_connection` does both).
+        """
+        idle = await self._pop_idle_connection(account)
+        if idle is None:
+            return await self.get_connection_or_fail(account, folder)
+
+        connection = idle.connection
+        try:
+            if folder:
+                await self.select_folder(connection, account, folder)
+            elif time.monotonic() - idle.released_at > CONNECTION_NOOP_AFTER:
+                # Without a SELECT nothing proves the session survived the idle period, so probe it.
+                if (await connection.noop()).result != "OK":
+                    raise ConnectionError("NOOP rejected")
+        except ValueError:
+            await self.close_connection(connection, account)
+            raise
+        except Exception:
+            # The pooled connection went stale while idle; fall back to a fresh one.
+            self._logger.debug(f"Discarding stale pooled connection for {account.email}")
+            await self.close_connection(connection, account)
+            return await self.get_connection_or_fail(account, folder)
+
+        self._logger.debug(f"Reusing pooled IMAP connection for {account.email}:{folder}")
+        return connection
+
+    @asynccontextmanager
+    async def pooled_connection(self, account: Account, folder: str | None = None) -> AsyncGenerator[IMAP4_SSL, None]:
+        """
+        Acquire a pooled connection for the duration of the block.
+
+        The connection goes back to the pool when the block completes. If the block raises (or is cancelled) the
+        session's state is unknown, so the connection is closed instead.
+        """
+        connection = await self.acquire_connection(account, folder)
+        try:
+            yield connection
+        except BaseException:
+            await self.close_connection(connection, account)
+            raise
+        await self.release_connection(connection, account)
+
+    async def release_connection(self, connection: IMAP4_SSL, account: Account) -> None:
+        """Return a connection to the account's pool, closing it instead if the pool is full or it's unusable."""
+        pool = self._idle_connections.setdefault(account.email, [])
+        if len(pool) >= settings.imap.max_idle_connections_per_account or not self._is_reusable(connection):
+            await self.close_connection(connection, account)
+            return
+        pool.append(_IdleConnection(connection=connection, released_at=time.monotonic()))
+
+    async def _pop_idle_connection(self, account: Account) -> _IdleConnection | None:
+        """Take the most recently released pooled connection that hasn't outlived the idle TTL."""
+        pool = self._idle_connections.get(account.email)
+        if not pool:
+            return None
+
+        expires_before = time.monotonic() - settings.imap.connection_idle_ttl
+        while pool:
+            idle = pool.pop()
+            if idle.released_at >= expires_before and self._is_reusable(idle.connection):
+                return idle
+            await self.close_connection(idle.connection, account)
+        return None
+
+    def _is_reusable(self, connection: IMAP4_SSL) -> bool:
+        """Whether the connection is still logged in (authenticated or with a folder selected)."""
+        try:
+            return connection.get_state() in ("AUTH", "SELECTED")
+        except Exception:
+            return False
+
     async def get_connection_or_fail(self, account: Account, folder: str | None = None) -> IMAP4_SSL:
         """Get an IMAP connection for the account."""
         connection = await self.get_connection(account, folder)
@@ -98,20 +188,11 @@ class ConnectionManager:
                 return None
 
             if folder:
-                # Quote folder names that contain spaces or special characters
-                # IMAP requires folder names with spaces to be quoted
-                quoted_folder = (
-                    f'"{folder}"'
-                    if " " in folder or any(c in folder for c in ["(", ")", "{", "}", "%", "*", '"', "\\"])
-                    else folder
-                )
-                select_response = await connection.select(quoted_folder)
-                if select_response.result != "OK":
-                    self._logger.error(
-                        f"Failed to select folder '{folder}' (as {quoted_folder}) for {account.email}: {select_response.result}"
-                    )
+                try:
+                    await self.select_folder(connection, account, folder)
+                except ValueError:
                     await self.close_connection(connection, account)
-                    raise ValueError(f"Failed to select folder '{folder}': {select_response.result}")
+                    raise
 
             self._logger.debug(f"Created new IMAP connection for {account.email}:{folder}")
             return connection
@@ -120,6 +201,23 @@ class ConnectionManager:
             self._logger.warning(f"Failed to create IMAP connection for {account.email}", exc_info=True)
             raise
 
+    async def select_folder(self, connection: IMAP4_SSL, account: Account, folder: str) -> Response:
+        """Select a folder on an open connection, raising if the server rejects it."""
+        # Quote folder names that contain spaces or special characters
+        # IMAP requires folder names with spaces to be quoted
+        quoted_folder = (
+            f'"{folder}"'
+            if " " in folder or any(c in folder for c in ["(", ")", "{", "}", "%", "*", '"', "\\"])
+            else folder
+        )
+        select_response = await connection.select(quoted_folder)
+        if select_response.result != "OK":
+            self._logger.error(
+                f"Failed to select folder '{folder}' (as {quoted_folder}) for {account.email}: {select_response.result}"
+            )
+            raise ValueError(f"Failed to select folder '{folder}': {select_response.result}")
+        return select_response
+
     async def close_connection(self, connection: IMAP4_SSL, account: Account) -> None:
         """Close an IMAP connection."""
         try:
@@ -136,5 +234,11 @@ class ConnectionManager:
             self._logger.warning(f"Error closing connection for {account.email}: {e}")
 
     async def close_all_connections(self) -> None:
-        """Close all connections - simplified since we don't track persistent connections."""
-        self._logger.info("Connection manager cleanup complete (no persistent connections to close)")
+        """Close all pooled connections."""
+        pools = self._idle_connections
+        self._idle_connections = {}
+        connections = [idle.connection for pool in pools.values() for idle in pool]
+        await asyncio.gather(
+            *(asyncio.wait_for(connection.logout(), timeout=5) for connection in connections), return_exceptions=True
+        )
+        self._logger.info(f"Connection manager cleanup complete ({len(connections)} pooled connections closed)")
@@ -0,0 +1,157 @@
+import logging
+import re
+from collections.abc import Iterator
+from email.message import Message
+from email.parser import Parser
+from uuid import UUID
+
+from aioimaplib import Response
+
+from app.api.payloads.messages import Message as NylasMessage
+from app.utils.message_utils import MessageUtils
+
+logger = logging.getLogger(__name__)
+
+# Matches a FETCH header line from its start up to the literal length marker, capturing the sequence number, the UID
+# (when requested) and the literal size, e.g. b'12 FETCH (FLAGS (\\Seen) UID 42 BODY[] {1437}'.
+FETCH_HEADER_PATTERN = re.compile(rb"(?:\*\s+)?(\d+)\s+FETCH\s*\((?:[^{]*?\bUID\s+(\d+))?[^{]*\{(\d+)\}")
+# The FLAGS item of a FETCH response, capturing the space-separated flags.
+FETCH_FLAGS_PATTERN = re.compile(rb"\bFLAGS\s*\(([^)]*)\)")
+
+# Whole-message and header-only FETCH items. PEEK keeps the server from setting \Seen (and echoing the new FLAGS back)
+# for every message we read, which RFC822 / BODY[] would do; FLAGS comes back in the same response for unread/starred.
+MESSAGE_FETCH_ITEMS = "(FLAGS BODY.PEEK[])"
+HEADER_FETCH_ITEMS = "(FLAGS BODY.PEEK[HEADER])"
+
+# Parsers only hold their message class and policy, so one instance is shared by every parse (and thread).
+MESSAGE_PARSER = Parser()
+
+# Maximum number of messages requested per FETCH command. Whole responses are buffered before parsing, so this bounds
+# the memory one FETCH of full messages can take as well as the command line length.
+FETCH_BATCH_SIZE = 100
+
+
+class FetchUtils:
+    """Utility class for building IMAP FETCH requests and parsing their responses."""
+
+    @staticmethod
+    def format_sequence_set(uids: list[int]) -> str:
+        """Format sorted UIDs as a compact IMAP sequence set, collapsing contiguous runs into `a:b` ranges."""
+        ranges: list[str] = []
+        run_start = run_end = uids[0]
+        for uid in uids[1:]:
+            if uid == run_end + 1:
+                run_end = uid
+                continue
+            ranges.append(f"{run_start}:{run_end}" if run_start != run_end else str(run_start))
+            run_start = run_end = uid
+        ranges.append(f"{run_start}:{run_end}" if run_start != run_end else str(run_start))
+        return ",".join(ranges)
+
+    @staticmethod
+    def parse_message(payload: memoryview | bytes, headers_only: bool = False) -> Message:
+        """Parse an RFC822 literal straight from the FETCH buffer, without materializing a `bytes` copy first."""
+        # Same surrogateescape decoding `email.message_from_bytes` applies, but `str()` accepts any buffer.
+        # With headers_only the body is kept as an opaque string, skipping the multipart boundary scan.
+        return MESSAGE_PARSER.parsestr(str(payload, "ascii", "surrogateescape"), headersonly=headers_only)
+
+    @staticmethod
+    def convert_fetched_messages(
+        fetch_response: Response, uids: list[int], grant_id: UUID, folder: str
+    ) -> list[NylasMessage]:
+        """
+        Parse the messages of a FETCH response and convert them to Nylas format.
+
+        This is the CPU-bound part of listing (MIME parsing and body decoding), so async callers run it in an executor.
+
+        Args:
+            fetch_response: The response from a FETCH of MESSAGE_FETCH_ITEMS
+            uids: The requested UIDs (or sequence numbers), in the order to return their messages
+            grant_id: The grant the messages belong to
+            folder: The folder the messages were fetched from
+
+        Returns:
+            The converted messages; ones missing from the response or failing to parse are skipped
+        """
+        raw_messages = FetchUtils.parse_fetch_response(fetch_response)
+        message_flags = FetchUtils.parse_fetch_flags(fetch_response)
+        messages: list[NylasMessage] = []
+        for uid in uids:
+            raw_message = raw_messages.get(uid)
+            if raw_message is None:
+                continue
+            try:
+                parsed_message = FetchUtils.parse_message(raw_message)
+                messages.append(
+                    MessageUtils.convert_to_nylas_format(parsed_message, grant_id, folder, message_flags.get(uid))
+                )
+            except Exception:
+                logger.exception(f"Failed to process message UID {uid}")
+        return messages
+
+    @staticmethod
+    def parse_fetch_response(fetch_response: Response) -> dict[int, memoryview]:
+        """
+        Parse the literals of a multi-message FETCH response.
+
+        Args:
+            fetch_response: The response from a FETCH command
+
+        Returns:
+            Each message's literal keyed by its UID when requested, otherwise by its sequence number
+        """
+        messages: dict[int, memoryview] = {}
+        try:
+            for key, _, payload, _ in FetchUtils._iter_fetch_literals(fetch_response):
+                messages[key] = payload
+        except Exception as e:
+            logger.error(f"Failed to parse fetch response: {e}")
+        return messages
+
+    @staticmethod
+    def parse_fetch_flags(fetch_response: Response) -> dict[int, frozenset[str]]:
+        """
+        Parse the FLAGS of each message in a multi-message FETCH response that also returned literals.
+
+        Args:
+            fetch_response: The response from a FETCH command
+
+        Returns:
+            Each message's flags (e.g. `\\Seen`) keyed like `parse_fetch_response`; messages without FLAGS are left out
+        """
+        flags: dict[int, frozenset[str]] = {}
+        try:
+            for key, header_line, _, trailing_line in FetchUtils._iter_fetch_literals(fetch_response):
+                # Servers may send FLAGS before the literal or after it, on the line that closes the FETCH.
+                match = FETCH_FLAGS_PATTERN.search(header_line) or FETCH_FLAGS_PATTERN.search(trailing_line)
+                if match is not None:
+                    flags[key] = frozenset(match.group(1).decode("ascii", "replace").split())
+        except Exception as e:
+            logger.error(f"Failed to parse fetch flags: {e}")
+        return flags
+
+    @staticmethod
+    def _iter_fetch_literals(fetch_response: Response) -> Iterator[tuple[int, bytes, memoryview, bytes]]:
+        """Yield each literal's key (UID or sequence number), FETCH header line, payload and closing line."""
+        lines = fetch_response.lines
+        idx = 0
+        while idx < len(lines) - 1:
+            line = lines[idx]
+            idx += 1
+            # FETCH header lines look like b'1 FETCH (RFC822 {1437}' or b'1 FETCH (UID 42 RFC822 {1437}'.
+            if not isinstance(line, (bytes, bytearray)):
+                continue
+            match = FETCH_HEADER_PATTERN.match(line)
+            if match is None:
+                continue
+            # The literal announced by {N} is the next line; view exactly N bytes of it without copying, and
+            # step over it so message content is never scanned for header lines.
+            payload = lines[idx]
+            idx += 1
+            if not isinstance(payload, (bytes, bytearray)):
+                continue
+            # The rest of the FETCH (often just b')') follows the literal, unless the next message starts right away.
+            trailing_line = lines[idx] if idx < len(lines) else b""
+            if not isinstance(trailing_line, (bytes, bytearray)) or FETCH_HEADER_PATTERN.match(trailing_line):
+                trailing_line = b""
+            yield int(match.group(2) or match.group(1)), line, memoryview(payload)[: int(match.group(3))], trailing_line
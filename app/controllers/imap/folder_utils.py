@@ -1,4 +1,9 @@
+import asyncio
 import logging
+import re
+import sys
+import time
+from collections import defaultdict
 from typing import List
 
 from app.controllers.imap.connection import ConnectionManager
@@ -6,6 +11,18 @@ from app.models import Account
 
 logger = logging.getLogger(__name__)
 
+# Matches the part of a LIST response after the flags: the quoted hierarchy delimiter followed by the folder name,
+# which is either quoted (group 1) or bare (group 2).
+LIST_RESPONSE_PATTERN = re.compile(rb'\)\s*"[^"]*"\s*(?:"(.*)"|(.*?))\s*$')
+
+# Folder lists rarely change, so an account's LIST result is reused for this many seconds.
+FOLDER_CACHE_TTL = 300
+
+# Account email -> (expiry on the monotonic clock, folder names). The per-account lock makes concurrent misses share a
+# single LIST.
+_folder_cache: dict[str, tuple[float, list[str]]] = {}
+_folder_cache_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
 
 class FolderUtils:
     """Utility class for IMAP folder operations."""
@@ -15,7 +32,7 @@ class FolderUtils:
         connection_manager: ConnectionManager, account: Account, max_folders: int = 15
     ) -> List[str]:
         """
-        Get list of folders for an account.
+        Get list of folders for an account, served from a short-lived per-account cache when possible.
 
         Args:
             connection_manager: The connection manager to use
@@ -25,44 +42,60 @@ class FolderUtils:
         Returns:
             List of folder names
         """
-        try:
-            connection = await connection_manager.get_connection_or_fail(account)
-
-            response = await connection.list('""', "*")
-            folders = []
+        cached = _folder_cache.get(account.email)
+        if cached is None or cached[0] < time.monotonic():
+            async with _folder_cache_locks[account.email]:
+                cached = _folder_cache.get(account.email)
+                if cached is None or cached[0] < time.monotonic():
+                    try:
+                        folders = await FolderUtils._list_account_folders(connection_manager, account)
+                    except Exception:
+                        logger.exception(f"Failed to get folders for {account.email}")
+                        # Return common default folders as fallback
+                        return ["INBOX", "Sent"]
+                    cached = (time.monotonic() + FOLDER_CACHE_TTL, folders)
+                    _folder_cache[account.email] = cached
+
+        folders = cached[1]
+        # Limit folders per account to prevent resource exhaustion
+        if len(folders) > max_folders:
+            logger.warning(f"Limited {account.email} to first {max_folders} folders")
+        return folders[:max_folders]
 
-            # Parse LIST response
-            for line in response.lines:
-                # Skip the completion line
-                if b"LIST completed" in line or b"OK" in line:
-                    continue
+    @staticmethod
+    def invalidate_account_folders(account: Account) -> None:
+        """Drop an account's cached folder list, e.g. after a folder it named could not be selected."""
+        _folder_cache.pop(account.email, None)
 
-                # Parse folder from response like: b'(\\Archive) "." "Archive"' or b'(\\HasNoChildren) "/" INBOX'
-                folder_name = FolderUtils.parse_folder_from_list_response(line)
-                if folder_name:
-                    # TODO: Allow selecting what folders to include in a user?
-                    # Ignore these folders by default.
-                    if folder_name.lower() in ["drafts", "junk", "archive", "trash", "spam"]:
-                        continue
+    @staticmethod
+    async def _list_account_folders(connection_manager: ConnectionManager, account: Account) -> list[str]:
+        """LIST the account's folders, leaving out the ones that are never synced."""
+        async with connection_manager.pooled_connection(account) as connection:
+            response = await connection.list('""', "*")
 
-                    # Skip empty folder names
-                    if folder_name.strip():
-                        folders.append(folder_name)
+        folders = []
 
-            await connection_manager.close_connection(connection, account)
+        # Parse LIST response
+        for line in response.lines:
+            # Skip the completion line
+            if b"LIST completed" in line or b"OK" in line:
+                continue
 
-            # Limit folders per account to prevent resource exhaustion
-            if len(folders) > max_folders:
-                folders = folders[:max_folders]
-                logger.warning(f"Limited {account.email} to first {max_folders} folders")
+            # Parse folder from response like: b'(\\Archive) "." "Archive"' or b'(\\HasNoChildren) "/" INBOX'
+            folder_name = FolderUtils.parse_folder_from_list_response(line)
+            if folder_name:
+                # TODO: Allow selecting what folders to include in a user?
+                # Ignore these folders by default.
+                if folder_name.lower() in ["drafts", "junk", "archive", "trash", "spam"]:
+                    continue
 
-            logger.info(f"Found {len(folders)} folders for {account.email}: {folders}")
-            return folders
+                # Skip empty folder names
+                # Interned: folder names are long-lived and compared on every listener/UID-tracking lookup.
+                if folder_name.strip():
+                    folders.append(sys.intern(folder_name))
 
-        except Exception:
-            logger.exception(f"Failed to get folders for {account.email}")
-            # Return common default folders as fallback
-            return ["INBOX", "Sent"]
+        logger.info(f"Found {len(folders)} folders for {account.email}: {folders}")
+        return folders
 
     @staticmethod
     def parse_folder_from_list_response(line: bytes) -> str | None:
@@ -79,44 +112,15 @@ class FolderUtils:
             if not isinstance(line, bytes):
                 return None
 
-            # Extract folder name from IMAP LIST response
             # Format: (flags) "delimiter" "folder_name" OR (flags) "delimiter" folder_name
             # Example: b'(\\Drafts \\HasNoChildren) "/" Drafts'
             # Example: b'(\\Sent \\HasNoChildren) "/" "Sent Items"'
-
-            # Find the end of flags (closing parenthesis)
-            flags_end = line.find(b")")
-            if flags_end == -1:
-                return None
-
-            # Everything after the flags
-            after_flags = line[flags_end + 1 :].strip()
-
-            # Find the delimiter (first quoted string)
-            # The delimiter is always quoted, e.g., "/"
-            first_quote = after_flags.find(b'"')
-            if first_quote == -1:
-                return None
-
-            # Find the closing quote of the delimiter
-            second_quote = after_flags.find(b'"', first_quote + 1)
-            if second_quote == -1:
+            match = LIST_RESPONSE_PATTERN.search(line)
+            if match is None:
                 return None
 
-            # Everything after the delimiter is the folder name
-            folder_part = after_flags[second_quote + 1 :].strip()
-
-            if not folder_part:
-                return None
-
-            # If folder name is quoted, extract it
-            if folder_part.startswith(b'"') and folder_part.endswith(b'"'):
-                folder_name = folder_part[1:-1].decode("utf-8")
-            else:
-                # Unquoted folder name
-                folder_name = folder_part.decode("utf-8")
-
-            return folder_name.strip() if folder_name.strip() else None
+            folder_name = (match.group(1) if match.group(1) is not None else match.group(2)).decode("utf-8").strip()
+            return folder_name or None
 
         except Exception as e:
             logger.warning(f"Failed to parse folder from line {line.decode('utf-8', errors='ignore')}: {e}")
@@ -1,7 +1,10 @@
 import asyncio
-import email
 import logging
 import random
+import re
+import sys
+import time
+from collections import defaultdict
 from email.message import Message
 
 from aioimaplib import IMAP4_SSL, Response
@@ -10,6 +13,7 @@ from fastapi_async_sqlalchemy import db
 from app.constants.emails import HEADER_MESSAGE_ID
 from app.controllers.imap.connection import ConnectionManager
 from app.controllers.imap.email_processor import EmailProcessor
+from app.controllers.imap.fetch_utils import FETCH_BATCH_SIZE, MESSAGE_FETCH_ITEMS, FetchUtils
 from app.controllers.imap.folder_utils import FolderUtils
 from app.models import Account, Email, UidTracking
 from app.models.account import AccountStatus
@@ -18,6 +22,8 @@ from app.repos.email import EmailRepo
 from app.repos.uid_tracking import UidTrackingRepo
 from settings import settings
 
+EXISTS_PATTERN = re.compile(rb"(\d+) EXISTS")
+
 
 class IMAPListener:
     """Async IMAP listener that polls folders for new emails."""
@@ -32,8 +38,12 @@ class IMAPListener:
     ):
         self._logger = logging.getLogger(__name__)
         self._active_listeners: dict[str, asyncio.Task[None]] = {}  # account:folder -> task
+        self._listener_keys_by_account: defaultdict[str, set[str]] = defaultdict(set)  # account -> account:folder keys
         self._shutdown_event = asyncio.Event()
-        self._listener_lock = asyncio.Lock()
+        self._poll_semaphore = asyncio.Semaphore(settings.imap.max_concurrent_polls)
+        self._account_poll_semaphores: defaultdict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(settings.imap.max_concurrent_polls_per_account)
+        )
 
         self._connection_health_repo = connection_health_repo
         self._uid_tracking_repo = uid_tracking_repo
@@ -51,18 +61,17 @@ class IMAPListener:
 
             tasks = []
             for folder in folders:
-                task = asyncio.create_task(self._listen_to_folder(account, folder))
-
-                listener_key = f"{account.email}:{folder}"
-                async with self._listener_lock:
-                    if listener_key in self._active_listeners:
-                        self._logger.warning(f"Listener already active for {listener_key}")
-                        continue
-
-                    self._active_listeners[listener_key] = task
+                # Check-and-insert has no await in between, so it is atomic on the event loop without a lock.
+                listener_key = sys.intern(f"{account.email}:{folder}")
+                if listener_key in self._active_listeners:
+                    self._logger.warning(f"Listener already active for {listener_key}")
+                    continue
 
+                task = asyncio.create_task(self._listen_to_folder(account, folder))
+                self._active_listeners[listener_key] = task
+                self._listener_keys_by_account[account.email].add(listener_key)
                 tasks.append(task)
-                self._logger.info(f"Started polling for {account.email}:{folder}")
+                self._logger.info(f"Started polling for {listener_key}")
 
             return tasks
 
@@ -75,76 +84,44 @@ class IMAPListener:
         """Stop a specific listener."""
         listener_key = f"{account_email}:{folder}"
 
-        async with self._listener_lock:
-            task = self._active_listeners.get(listener_key)
-            if task and not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
+        task = self._active_listeners.pop(listener_key, None)
+        self._listener_keys_by_account.get(account_email, set()).discard(listener_key)
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
-                self._active_listeners.pop(listener_key, None)
-                self._logger.info(f"Stopped listener for {account_email}:{folder}")
+            self._logger.info(f"Stopped listener for {account_email}:{folder}")
 
     async def stop_account_listeners(self, account_email: str) -> None:
         """Stop all listeners for an account."""
-        tasks_to_cancel: list[asyncio.Task[None]] = []
-
-        async with self._listener_lock:
-            for listener_key in list(self._active_listeners.keys()):
-                if listener_key.startswith(f"{account_email}:"):
-                    task = self._active_listeners.pop(listener_key)
-                    if not task.done():
-                        tasks_to_cancel.append(task)
-
-        # Cancel tasks
-        for task in tasks_to_cancel:
-            task.cancel()
-
-        # Wait for cancellation
-        if tasks_to_cancel:
-            await asyncio.gather(*tasks_to_cancel, return_exceptions=True)
+        tasks: list[asyncio.Task[None]] = []
+        for listener_key in self._listener_keys_by_account.pop(account_email, set()):
+            task = self._active_listeners.pop(listener_key, None)
+            if task is not None:
+                tasks.append(task)
 
+        await self._cancel_and_wait(tasks)
+        self._account_poll_semaphores.pop(account_email, None)
         self._logger.info(f"Stopped all listeners for {account_email}")
 
     async def stop_all_listeners(self) -> None:
         """Stop all active listeners."""
         self._shutdown_event.set()
 
-        tasks_to_cancel: list[asyncio.Task[None]] = []
-        async with self._listener_lock:
-            for task in self._active_listeners.values():
-                if not task.done():
-                    tasks_to_cancel.append(task)
-            self._active_listeners.clear()
-
-        # Cancel all tasks
-        for task in tasks_to_cancel:
-            task.cancel()
+        tasks = list(self._active_listeners.values())
+        self._active_listeners.clear()
+        self._listener_keys_by_account.clear()
 
-        # Wait for cancellation with timeout
-        if tasks_to_cancel:
-            try:
-                await asyncio.wait_for(
-                    asyncio.gather(*tasks_to_cancel, return_exceptions=True),
-                    timeout=30,  # 30 second timeout
-                )
-            except asyncio.TimeoutError:
-                self._logger.warning("Timeout waiting for listeners to cancel, forcing shutdown")
-                # Force cleanup any remaining tasks
-                for task in tasks_to_cancel:
-                    if not task.done():
-                        self._logger.warning(f"Force cancelling stuck task: {task}")
-                        task.cancel()
-
-                # Give a short grace period for force cancellation
-                try:
-                    await asyncio.wait_for(
-                        asyncio.gather(*[t for t in tasks_to_cancel if not t.done()], return_exceptions=True), timeout=5
-                    )
-                except asyncio.TimeoutError:
-                    self._logger.error("Some tasks failed to cancel even after force cancellation")
+        pending = await self._cancel_and_wait(tasks, timeout=30)
+        if pending:
+            self._logger.warning(f"Timeout waiting for {len(pending)} listeners to cancel, forcing shutdown")
+            # Cancel again in case a listener swallowed the first cancellation, then give a short grace period.
+            pending = await self._cancel_and_wait(list(pending), timeout=5)
+            if pending:
+                self._logger.error(f"{len(pending)} listeners failed to cancel even after force cancellation")
 
         # Close all connections with timeout
         try:
@@ -159,113 +136,164 @@ class IMAPListener:
 
         self._logger.info("Stopped all IMAP listeners")
 
+    async def _cancel_and_wait(
+        self, tasks: list[asyncio.Task[None]], timeout: float | None = None
+    ) -> set[asyncio.Task[None]]:
+        """
+        Cancel listener tasks and wait for them to finish in a single pass.
+
+        Unlike `wait_for(gather(...))`, `asyncio.wait` neither cancels the tasks again on timeout nor re-raises their
+        CancelledError into the caller, so the caller's own cancellation is never swallowed and tasks that ignore
+        cancellation are returned as pending instead of stalling shutdown.
+
+        Returns:
+            The tasks still running once the timeout elapsed
+        """
+        tasks = [task for task in tasks if not task.done()]
+        if not tasks:
+            return set()
+
+        for task in tasks:
+            task.cancel()
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        return pending
+
     async def _listen_to_folder(self, account: Account, folder: str) -> None:
         """Poll a specific folder for new emails."""
+        listener_key = sys.intern(f"{account.email}:{folder}")
 
         consecutive_failures = 0
         max_failures = 5
         poll_interval = settings.imap.poll_interval
 
+        # Bound once: this loop runs for the lifetime of every folder listener.
+        shutdown_is_set = self._shutdown_event.is_set
+        wait_until = self._wait_until
+        mono = time.monotonic
+        poll_semaphore = self._poll_semaphore
+        account_poll_semaphore = self._account_poll_semaphores[account.email]
+
         # Add jitter to prevent thundering herd - spread polls across the interval
         jitter = random.uniform(0, min(settings.imap.poll_jitter_max, poll_interval * 0.5))
-        self._logger.debug(f"Starting polling for {account.email}:{folder} with {jitter:.1f}s jitter")
-        await asyncio.sleep(jitter)
-
-        while not self._shutdown_event.is_set():
-            connection: IMAP4_SSL | None = None
+        self._logger.debug(f"Starting polling for {listener_key} with {jitter:.1f}s jitter")
+        if not await wait_until(mono() + jitter):
+            return
+
+        while not shutdown_is_set():
+            # Polls start on a fixed cadence from a monotonic clock, so slow polls don't push the schedule back and
+            # wall-clock adjustments can't make the listener poll too eagerly or stall.
+            next_poll_at = mono() + poll_interval
             try:
                 await db.session.refresh(account)
                 if account.status != AccountStatus.active:
                     self._logger.debug(f"Account {account.email} is not active, skipping folder {folder}")
-                    for _ in range(poll_interval * 20):
-                        if self._shutdown_event.is_set():
-                            return
-                        await asyncio.sleep(0.1)
+                    if not await wait_until(mono() + poll_interval * 2):
+                        return
                     continue
 
-                connection = await self._connection_manager.get_connection_or_fail(account, folder)
-                search_response = await connection.search("ALL")
-                all_uids = self._parse_search_response(search_response)
-                last_seen_uid = await self._uid_tracking_repo.get_last_seen_uid(account.id, folder)
-                if last_seen_uid is None:
-                    self._logger.warning(
-                        f"No last seen UID found for {account.email}:{folder}. Creating new UID tracking"
-                    )
-                    last_seen_uid = all_uids[-1] if all_uids else 0
-                    await self._uid_tracking_repo.add(
-                        UidTracking(account_id=account.id, folder=folder, last_seen_uid=last_seen_uid), commit=True
-                    )
-                    self._logger.info(f"New UID tracking created for {account.email}:{folder}: {last_seen_uid}")
-
-                new_uids = [uid for uid in all_uids if uid > last_seen_uid]
-                if new_uids:
-                    self._logger.info(f"Found {len(new_uids)} new messages for {account.email}:{folder}: {new_uids}")
-                    await self._process_new_messages_by_uids(connection, account, folder, new_uids)
-                else:
-                    self._logger.debug(f"No new messages for {account.email}:{folder}")
+                # Bound how many folders hold an open connection at once, per account (so one mailbox can't open a
+                # socket per folder at the same time) and across the whole process. The account slot is taken
+                # first so waiting on a busy account never holds a process-wide slot.
+                async with account_poll_semaphore, poll_semaphore:
+                    await self._poll_folder(account, folder)
 
                 # Record successful poll
                 await self._record_connection_health(account.id, folder, True)
                 consecutive_failures = 0
 
-                await self._connection_manager.close_connection(connection, account)
-                connection = None
-
-                # Wait for next poll interval, checking for shutdown frequently
-                for _ in range(poll_interval * 10):
-                    if self._shutdown_event.is_set():
-                        return
-                    await asyncio.sleep(0.1)
+                # Wait for next poll, checking for shutdown frequently
+                if not await wait_until(next_poll_at):
+                    return
 
             except asyncio.CancelledError:
-                self._logger.info(f"Polling cancelled for {account.email}:{folder}")
+                self._logger.info(f"Polling cancelled for {listener_key}")
                 break
 
             except Exception as e:
                 consecutive_failures += 1
                 error_msg = str(e)
 
-                self._logger.warning(
-                    f"Polling error for {account.email}:{folder} (failure {consecutive_failures}): {error_msg}"
-                )
+                self._logger.warning(f"Polling error for {listener_key} (failure {consecutive_failures}): {error_msg}")
 
                 await self._record_connection_health(account.id, folder, False, error_msg)
 
-                # Close connection on error
-                if connection:
-                    try:
-                        await self._connection_manager.close_connection(connection, account)
-                    except Exception:
-                        pass
-                    connection = None
-
                 # Check if we should stop this folder
                 if consecutive_failures >= max_failures:
                     self._logger.error(
-                        f"Max failures reached for {account.email}:{folder}. Check if something is wrong with the "
-                        "account."
+                        f"Max failures reached for {listener_key}. Check if something is wrong with the account."
                     )
-                    for _ in range(poll_interval * 20):
-                        if self._shutdown_event.is_set():
-                            return
-                        await asyncio.sleep(0.1)
+                    if not await wait_until(mono() + poll_interval * 2):
+                        return
                     continue
 
                 # Exponential backoff for errors, but not too long
                 backoff_time = min(120, 10 * consecutive_failures)  # Max 2 minutes
                 self._logger.debug(f"Backing off for {backoff_time}s after error")
-
-                for _ in range(int(backoff_time * 10)):  # Check shutdown every 0.1 seconds
-                    if self._shutdown_event.is_set():
-                        return
-                    await asyncio.sleep(0.1)
+                if not await wait_until(mono() + backoff_time):
+                    return
 
         # Clean up
-        listener_key = f"{account.email}:{folder}"
-        async with self._listener_lock:
-            self._active_listeners.pop(listener_key, None)
+        self._active_listeners.pop(listener_key, None)
+        self._listener_keys_by_account.get(account.email, set()).discard(listener_key)
+
+        self._logger.info(f"Stopped polling for {listener_key}")
 
-        self._logger.info(f"Stopped polling for {account.email}:{folder}")
+    async def _wait_until(self, deadline: float) -> bool:
+        """
+        Sleep until a `time.monotonic()` deadline, waking early on shutdown.
+
+        Waits on the shutdown event itself rather than re-checking it on a short timer, so an idle folder costs one
+        timer per poll interval instead of ten wakeups a second.
+
+        Returns:
+            False if shutdown was requested while waiting, True otherwise
+        """
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            try:
+                await asyncio.wait_for(self._shutdown_event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+        return not self._shutdown_event.is_set()
+
+    async def _poll_folder(self, account: Account, folder: str) -> None:
+        """Run a single poll of a folder on a pooled connection, keeping it warm for the next poll unless it failed."""
+        async with self._connection_manager.pooled_connection(account) as connection:
+            await self._poll_selected_folder(connection, account, folder)
+
+    async def _poll_selected_folder(self, connection: IMAP4_SSL, account: Account, folder: str) -> None:
+        """Select a folder, find messages past the last seen UID and process them."""
+        select_response = await self._connection_manager.select_folder(connection, account, folder)
+        last_seen_uid = await self._uid_tracking_repo.get_last_seen_uid(account.id, folder)
+
+        # Messages are tracked by sequence number, so the EXISTS count from SELECT is the highest one in use:
+        # if it hasn't moved past the last seen one there is nothing to SEARCH or FETCH.
+        message_count = self._parse_exists(select_response)
+        if last_seen_uid is not None and message_count is not None and message_count <= last_seen_uid:
+            self._logger.debug(f"No new messages for {account.email}:{folder}")
+            return
+
+        if last_seen_uid is None:
+            # Cold start: begin tracking from the current end of the folder rather than processing its history.
+            self._logger.warning(f"No last seen UID found for {account.email}:{folder}. Creating new UID tracking")
+            if message_count is None:
+                all_uids = self._parse_search_response(await connection.search("ALL"))
+                message_count = all_uids[-1] if all_uids else 0
+            await self._uid_tracking_repo.add(
+                UidTracking(account_id=account.id, folder=folder, last_seen_uid=message_count), commit=True
+            )
+            self._logger.info(f"New UID tracking created for {account.email}:{folder}: {message_count}")
+            return
+
+        # Only ask for the range past the last seen message instead of listing the whole folder. `n:*` still matches
+        # the last message when n is past the end, hence the filter.
+        search_response = await connection.search(f"{last_seen_uid + 1}:*")
+        new_uids = [uid for uid in self._parse_search_response(search_response) if uid > last_seen_uid]
+        if new_uids:
+            self._logger.info(f"Found {len(new_uids)} new messages for {account.email}:{folder}: {new_uids}")
+            await self._process_new_messages_by_uids(connection, account, folder, new_uids)
+        else:
+            self._logger.debug(f"No new messages for {account.email}:{folder}")
 
     async def _update_last_seen_uid(self, account_id: int, folder: str, uid: int) -> None:
         """Update the last seen UID for an account/folder combination using repository."""
@@ -289,92 +317,65 @@ class IMAPListener:
     async def _process_new_messages_by_uids(
         self, connection: IMAP4_SSL, account: Account, folder: str, new_uids: list[int]
     ) -> None:
-        """Process new messages in the folder based on a list of UIDs."""
+        """Process new messages in the folder based on a list of UIDs, fetching them in bounded batches."""
+        loop = asyncio.get_running_loop()
         try:
-            # Fetch message data for each UID
-            fetch_response = await connection.fetch(",".join(map(str, new_uids)), "RFC822")
-            messages = self._parse_fetch_response(fetch_response)
-            for uid, message_bytes in messages.items():
-                try:
-                    raw_message = email.message_from_bytes(message_bytes)
-                    nylas_message = await self._email_processor.process_email(account, folder, uid, raw_message)
-
-                    # Update UID tracking
-                    await self._update_last_seen_uid(account.id, folder, uid)
-                    await self._upsert_cache(account, raw_message, folder, uid, nylas_message.thread_id)
-                except Exception:
-                    self._logger.warning(f"Failed to process message {uid} for {account.email}:{folder}", exc_info=True)
-                    continue
+            for start in range(0, len(new_uids), FETCH_BATCH_SIZE):
+                batch = new_uids[start : start + FETCH_BATCH_SIZE]
+                fetch_response = await connection.fetch(FetchUtils.format_sequence_set(batch), MESSAGE_FETCH_ITEMS)
+                messages = FetchUtils.parse_fetch_response(fetch_response)
+                last_processed_uid: int | None = None
+                for uid, payload in messages.items():
+                    try:
+                        # MIME parsing is CPU-bound; run it off the event loop so it doesn't stall other polls.
+                        raw_message = await loop.run_in_executor(None, FetchUtils.parse_message, payload)
+                        nylas_message = await self._email_processor.process_email(account, folder, uid, raw_message)
+                        await self._upsert_cache(account, raw_message, folder, uid, nylas_message.thread_id)
+                        last_processed_uid = uid if last_processed_uid is None else max(last_processed_uid, uid)
+                    except Exception:
+                        self._logger.warning(
+                            f"Failed to process message {uid} for {account.email}:{folder}", exc_info=True
+                        )
+                        continue
+
+                # Persist progress once per batch (one upsert instead of one per message) so a crash mid-backlog
+                # doesn't re-fetch from scratch.
+                if last_processed_uid is not None:
+                    await self._update_last_seen_uid(account.id, folder, last_processed_uid)
+                await self._uid_tracking_repo.commit()
 
             self._logger.info(f"Processed {len(new_uids)} new messages for {account.email}:{folder}")
-            await self._uid_tracking_repo.commit()
 
         except Exception:
             self._logger.warning(f"Failed to process new messages for {account.email}:{folder}", exc_info=True)
             raise
 
+    def _parse_exists(self, select_response: Response) -> int | None:
+        """Parse the message count from the untagged EXISTS line of a SELECT response."""
+        for line in select_response.lines:
+            if isinstance(line, (bytes, bytearray)):
+                match = EXISTS_PATTERN.search(line)
+                if match:
+                    return int(match.group(1))
+        return None
+
     def _parse_search_response(self, search_response: Response) -> list[int]:
         """Parse UIDs from SEARCH response."""
         uids: list[int] = []
         try:
             for line in search_response.lines:
                 # The line may look like: b'1 2 3 4 5 6 7 8'
-                if isinstance(line, bytes):
-                    line_str = line.decode("utf-8", errors="ignore").strip()
-                else:
-                    line_str = str(line).strip()
-                # Skip lines that are completion messages
-                if "SEARCH completed" in line_str or "OK" in line_str:
+                if not isinstance(line, (bytes, bytearray)):
+                    line = str(line).encode()
+                # Skip the status line in any case, e.g. b'Search completed (0.001 + 0.000 secs).' (Dovecot)
+                # or b'Completed (2 msgs in 0.000 secs)' (Cyrus)
+                if b"completed" in line.lower():
                     continue
-                # Split by whitespace and collect digits
-                for part in line_str.split():
-                    if part.isdigit():
-                        uids.append(int(part))
+                uids.extend(int(token) for token in line.split() if token.isdigit())
         except Exception as e:
             self._logger.error(f"Failed to parse search response: {e}")
         return uids
 
-    def _parse_fetch_response(self, fetch_response: Response) -> dict[int, bytes]:
-        """Parse messages from FETCH response."""
-        messages = {}
-        try:
-            lines = fetch_response.lines
-            i = 0
-            while i < len(lines):
-                line = lines[i]
-                # Look for the FETCH header line, e.g. b'1 FETCH (RFC822 {1437}'
-                if isinstance(line, (bytes, bytearray)) and b"FETCH" in line and b"RFC822" in line:
-                    # Try to extract UID if present, else use the sequence number
-                    uid = None
-                    # Try to extract UID from the line, fallback to sequence number
-                    if b"UID " in line:
-                        try:
-                            uid_part = line.split(b"UID ")[1]
-                            uid_str = uid_part.split(b" ")[0]
-                            uid = int(uid_str)
-                        except Exception:
-                            pass
-                    if uid is None:
-                        # Fallback: get the sequence number at the start of the line
-                        try:
-                            uid = int(line.split(b" ")[0])
-                        except Exception:
-                            continue  # skip if can't parse
-
-                    # The next line should be the message bytes (bytearray)
-                    if i + 1 < len(lines) and isinstance(lines[i + 1], (bytes, bytearray)):
-                        message_bytes = lines[i + 1]
-                        messages[uid] = bytes(message_bytes)
-                        i += 2  # Skip to the line after the message
-                        # Optionally, skip the closing b')' line if present
-                        if i < len(lines) and lines[i] == b")":
-                            i += 1
-                        continue
-                i += 1
-        except Exception as e:
-            self._logger.error(f"Failed to parse fetch response: {e}")
-        return messages
-
     async def _upsert_cache(
         self, account: Account, raw_message: Message, folder: str, uid: int, thread_id: str
     ) -> None:
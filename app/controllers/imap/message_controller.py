@@ -1,16 +1,38 @@
-import email
+import asyncio
+import dataclasses
 import logging
+import re
+import time
 import urllib.parse
+from collections import Counter, OrderedDict, defaultdict
 from email.message import Message as PythonEmailMessage
 from imaplib import IMAP4_SSL
-from typing import Any
 
 from app.api.payloads.messages import Message
 from app.controllers.email.message import MessageResult
 from app.controllers.imap.connection import ConnectionManager
+from app.controllers.imap.fetch_utils import FETCH_BATCH_SIZE, HEADER_FETCH_ITEMS, MESSAGE_FETCH_ITEMS, FetchUtils
 from app.controllers.imap.folder_utils import FolderUtils
 from app.models import Account
 from app.utils.message_utils import MessageUtils
+from settings import settings
+
+# A whole whitespace-separated number in a SEARCH result line.
+SEARCH_RESULT_ID_PATTERN = re.compile(rb"(?<!\S)\d+(?!\S)")
+
+# How many folders get_message_by_id searches at the same time (each search holds its own connection).
+MAX_PARALLEL_FOLDER_SEARCHES = 5
+
+# Recently fetched messages kept for repeat lookups (thread views, replies, attachment downloads).
+MESSAGE_CACHE_SIZE = 256
+MESSAGE_CACHE_TTL = 300  # seconds
+# Messages whose body plus attachments exceed this many bytes aren't cached, bounding the cache's memory.
+MESSAGE_CACHE_MAX_MESSAGE_BYTES = 1024 * 1024
+
+# list_messages spreads its FETCHes over up to this many connections to the folder, each given at least
+# LIST_FETCH_MIN_CHUNK messages so small pages don't pay for extra logins.
+MAX_PARALLEL_LIST_FETCHES = 4
+LIST_FETCH_MIN_CHUNK = 25
 
 
 class MessageController:
@@ -19,9 +41,20 @@ class MessageController:
     def __init__(self, connection_manager: ConnectionManager):
         self._logger = logging.getLogger(__name__)
         self._connection_manager = connection_manager
+        # (grant id, Message-ID) -> (expiry on the monotonic clock, full-body result), least recently used first.
+        self._message_cache: OrderedDict[tuple[str, str], tuple[float, MessageResult]] = OrderedDict()
+        # (grant id, Message-ID, include_body) -> lookup in flight, shared by concurrent requests for the same message.
+        self._pending_lookups: dict[tuple[str, str, bool], asyncio.Task[MessageResult | None]] = {}
+        # grant id -> how many lookups found their message in each folder, to search the likeliest folders first.
+        self._folder_hits: defaultdict[str, Counter[str]] = defaultdict(Counter)
 
     async def get_message_by_id(
-        self, account: Account, message_id: str, folder: str | None = None, uid: int | None = None
+        self,
+        account: Account,
+        message_id: str,
+        folder: str | None = None,
+        uid: int | None = None,
+        include_body: bool = True,
     ) -> MessageResult | None:
         """
         Fetch a message by its Message-ID from IMAP server across all folders.
@@ -29,6 +62,8 @@ class MessageController:
         Args:
             account: The account to search in
             message_id: The Message-ID to search for (e.g., '<abc123@domain.com>')
+            include_body: Whether to download the whole message; when False only its header block is fetched, leaving
+                the body and attachments empty
 
         Returns:
             Message object in Nylas format or None if not found
@@ -36,68 +71,210 @@ class MessageController:
         try:
             # Decode and format the message ID
             search_message_id = self._decode_message_id(message_id)
-            if folder is not None:
-                # Search first in the specified folder with the provided UID.
-                message = await self._get_message_from_folder(account, search_message_id, folder, uid)
-                if message and message.raw_message.get("Message-ID") == search_message_id:
-                    self._logger.info(f"Used cached message metadata for {search_message_id}")
-                    return message
+            cache_key = (str(account.uuid), search_message_id)
+            cached = self._get_cached_message(cache_key)
+            if cached:
+                self._logger.info(f"Serving {search_message_id} from the message cache")
+                return cached
+
+            lookup_key = (*cache_key, include_body)
+            lookup = self._pending_lookups.get(lookup_key)
+            if lookup is None:
+                lookup = asyncio.create_task(self._find_message(account, search_message_id, folder, uid, include_body))
+                self._pending_lookups[lookup_key] = lookup
+                lookup.add_done_callback(lambda task: self._finish_lookup(lookup_key, task))
+            else:
+                self._logger.info(f"Joining in-flight lookup of {search_message_id}")
+
+            # Shielded so one caller going away doesn't cancel the lookup for the others sharing it.
+            message = await asyncio.shield(lookup)
+            return self._copy_result(message) if message else None
 
-            folders = await FolderUtils.get_account_folders(self._connection_manager, account)
-            self._logger.info(f"Searching for message ID: {search_message_id} in {len(folders)} folders")
-            for search_folder in folders:
-                if search_folder == folder:
-                    continue
+        except Exception:
+            self._logger.exception(f"Error fetching message {message_id} for account {account.email}")
+            return None
 
-                message = await self._get_message_from_folder(account, search_message_id, search_folder)
-                if message:
-                    return message
+    async def _find_message(
+        self, account: Account, search_message_id: str, folder: str | None, uid: int | None, include_body: bool
+    ) -> MessageResult | None:
+        """Find a message on the server, trying the known folder and UID before searching every folder."""
+        if folder is not None:
+            # Search first in the specified folder with the provided UID.
+            message = await self._get_message_from_folder(
+                account, search_message_id, folder, uid, include_body=include_body
+            )
+            if message and message.raw_message.get("Message-ID") == search_message_id:
+                self._logger.info(f"Used cached message metadata for {search_message_id}")
+                self._folder_hits[str(account.uuid)][folder] += 1
+                return message
+
+        folders = await FolderUtils.get_account_folders(self._connection_manager, account)
+        self._logger.info(f"Searching for message ID: {search_message_id} in {len(folders)} folders")
+        # Folders that held this account's earlier lookups go first (a stable sort, so ties keep the server's order),
+        # so with more folders than parallel searches the likely hit isn't left waiting for a free slot.
+        folder_hits = self._folder_hits[str(account.uuid)]
+        message = await self._search_folders(
+            account,
+            search_message_id,
+            sorted(
+                (search_folder for search_folder in folders if search_folder != folder),
+                key=lambda search_folder: -folder_hits[search_folder],
+            ),
+            include_body=include_body,
+        )
+        if message:
+            folder_hits[message.message.folders[0]] += 1
+            return message
+
+        self._logger.info(f"Message with ID {search_message_id} not found in any of {len(folders)} folders")
+        return None
 
-            self._logger.info(f"Message with ID {search_message_id} not found in any of {len(folders)} folders")
+    def _get_cached_message(self, cache_key: tuple[str, str]) -> MessageResult | None:
+        """Return a copy of a cached, unexpired result, refreshing its recency."""
+        entry = self._message_cache.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._message_cache[cache_key]
             return None
 
-        except Exception:
-            self._logger.exception(f"Error fetching message {message_id} for account {account.email}")
+        self._message_cache.move_to_end(cache_key)
+        return self._copy_result(result)
+
+    @staticmethod
+    def _copy_result(result: MessageResult) -> MessageResult:
+        """Copy a shared (cached or coalesced) result, since callers adjust fields such as `unread` on what they get."""
+        return dataclasses.replace(result, message=result.message.model_copy(deep=True))
+
+    def _finish_lookup(self, lookup_key: tuple[str, str, bool], lookup: asyncio.Task[MessageResult | None]) -> None:
+        """Forget a finished shared lookup and cache the message it found with its body."""
+        self._pending_lookups.pop(lookup_key, None)
+        # Checking exception() also marks it retrieved; it's re-raised to (and logged by) each waiting caller.
+        if lookup.cancelled() or lookup.exception() is not None:
+            return
+        grant_id, message_id, include_body = lookup_key
+        result = lookup.result()
+        if result is not None and include_body:
+            self._cache_message((grant_id, message_id), result)
+
+    def invalidate_account_messages(self, account: Account) -> None:
+        """Drop the account's cached messages, e.g. after their flags were changed on the server."""
+        grant_id = str(account.uuid)
+        for cache_key in [cache_key for cache_key in self._message_cache if cache_key[0] == grant_id]:
+            del self._message_cache[cache_key]
+
+    def _cache_message(self, cache_key: tuple[str, str], result: MessageResult) -> None:
+        """Cache a full-body result unless it's too large, evicting the least recently used entries past the limit."""
+        message = result.message
+        message_size = len(message.body) + sum(attachment.size for attachment in message.attachments)
+        if message_size > MESSAGE_CACHE_MAX_MESSAGE_BYTES:
+            return
+
+        self._message_cache[cache_key] = (
+            time.monotonic() + MESSAGE_CACHE_TTL,
+            dataclasses.replace(result, message=message.model_copy(deep=True)),
+        )
+        self._message_cache.move_to_end(cache_key)
+        while len(self._message_cache) > MESSAGE_CACHE_SIZE:
+            self._message_cache.popitem(last=False)
+
+    async def _search_folders(
+        self, account: Account, search_message_id: str, folders: list[str], include_body: bool = True
+    ) -> MessageResult | None:
+        """
+        Search folders for a message concurrently, at most MAX_PARALLEL_FOLDER_SEARCHES (or the pool size) at a time.
+
+        Results are still taken in folder order, so a message present in several folders resolves to the same one as a
+        sequential scan would; searches left running once it's found are cancelled.
+        """
+        # Staying within the account's idle pool lets every search reuse a logged-in connection (re-SELECTing its
+        # folder) instead of logging in a connection that the pool would then have no room to keep.
+        pool_size = settings.imap.max_idle_connections_per_account
+        semaphore = asyncio.Semaphore(max(1, min(MAX_PARALLEL_FOLDER_SEARCHES, pool_size)))
+
+        async def search_folder(folder: str) -> MessageResult | None:
+            async with semaphore:
+                return await self._get_message_from_folder(
+                    account, search_message_id, folder, include_body=include_body
+                )
+
+        tasks = [asyncio.create_task(search_folder(folder)) for folder in folders]
+        try:
+            for task in tasks:
+                message = await task
+                if message:
+                    return message
             return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def _get_message_from_folder(
-        self, account: Account, search_message_id: str, folder: str, uid: int | None = None
+        self,
+        account: Account,
+        search_message_id: str,
+        folder: str,
+        uid: int | None = None,
+        include_body: bool = True,
     ) -> MessageResult | None:
-        """Search for a message by Message-ID in a specific folder."""
-        connection = None
+        """Search for a message by Message-ID in a specific folder, on a pooled connection."""
         try:
-            # Get connection for this folder
-            connection = await self._connection_manager.get_connection_or_fail(account, folder)
-
-            if uid is not None:
-                raw_message = await self._fetch_message_from_folder(connection, uid, folder)
-                if raw_message:
-                    self._logger.info(
-                        f"Successfully retrieved message {search_message_id} from folder {folder} using UID {uid}"
-                    )
-                    nylas_message = MessageUtils.convert_to_nylas_format(raw_message, account.uuid, folder)
-                    return MessageResult(message=nylas_message, raw_message=raw_message, uid=uid)
-
-            # If the UID is not provided or message not found, search for the message in this folder.
-            uid = await self._search_message_in_folder(connection, search_message_id, folder)
-            if uid:
-                raw_message = await self._fetch_message_from_folder(connection, uid, folder)
-                if raw_message:
-                    self._logger.info(f"Successfully retrieved message {search_message_id} from folder {folder}")
-                    nylas_message = MessageUtils.convert_to_nylas_format(raw_message, account.uuid, folder)
-                    return MessageResult(message=nylas_message, raw_message=raw_message, uid=uid)
-
+            async with self._connection_manager.pooled_connection(account, folder) as connection:
+                return await self._find_message_in_folder(
+                    connection, account, search_message_id, folder, uid, include_body
+                )
         except Exception as folder_error:
+            if isinstance(folder_error, ValueError):
+                # The folder could not be selected, so it may have been renamed or deleted since it was listed.
+                FolderUtils.invalidate_account_folders(account)
             self._logger.exception(f"Error searching folder {folder} for message {search_message_id}: {folder_error}")
-        finally:
-            if connection:
-                try:
-                    # Close the connection instead of releasing it back to the pool to prevent connection leaks.
-                    await self._connection_manager.close_connection(connection, account)
-                except Exception:
-                    pass
+            return None
+
+    async def _find_message_in_folder(
+        self,
+        connection: IMAP4_SSL,
+        account: Account,
+        search_message_id: str,
+        folder: str,
+        uid: int | None = None,
+        include_body: bool = True,
+    ) -> MessageResult | None:
+        """Look up a message on a connection with the folder already selected, trying the cached UID first."""
+        if uid is not None:
+            fetched = await self._fetch_message_from_folder(connection, uid, folder, include_body)
+            if fetched and fetched[0].get("Message-ID") == search_message_id:
+                self._logger.info(
+                    f"Successfully retrieved message {search_message_id} from folder {folder} using UID {uid}"
+                )
+                raw_message, flags = fetched
+                nylas_message = await self._convert_message(raw_message, account, folder, flags)
+                return MessageResult(message=nylas_message, raw_message=raw_message, uid=uid)
+            if fetched:
+                # Sequence numbers shift when earlier messages are expunged; the message may still be here.
+                self._logger.info(f"UID {uid} in folder {folder} no longer holds {search_message_id}")
+
+        # If the UID is not provided or message not found, search for the message in this folder.
+        uid = await self._search_message_in_folder(connection, search_message_id, folder)
+        if uid:
+            fetched = await self._fetch_message_from_folder(connection, uid, folder, include_body)
+            if fetched:
+                self._logger.info(f"Successfully retrieved message {search_message_id} from folder {folder}")
+                raw_message, flags = fetched
+                nylas_message = await self._convert_message(raw_message, account, folder, flags)
+                return MessageResult(message=nylas_message, raw_message=raw_message, uid=uid)
+
         return None
 
+    async def _convert_message(
+        self, raw_message: PythonEmailMessage, account: Account, folder: str, flags: frozenset[str] | None
+    ) -> Message:
+        """Convert a parsed message to Nylas format in an executor, since decoding its body is CPU-bound."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, MessageUtils.convert_to_nylas_format, raw_message, account.uuid, folder, flags
+        )
+
     def _decode_message_id(self, message_id: str) -> str:
         """
         Decode URL-encoded message ID and ensure proper format with angle brackets.
@@ -123,109 +300,53 @@ class MessageController:
         Returns:
             UID of the message if found, None otherwise
         """
-        try:
-            search_criteria = f'HEADER Message-ID "{search_message_id}"'
-            result = await connection.search(search_criteria)  # type: ignore
-
-            if result and result[1] and result[1][0]:
-                # Parse the response
-                response_bytes = result[1][0]
-                if isinstance(response_bytes, bytes):
-                    uids_str = response_bytes.decode().strip()
-                else:
-                    uids_str = str(response_bytes).strip()
+        search_criteria = f'HEADER Message-ID "{search_message_id}"'
+        result = await connection.search(search_criteria)  # type: ignore
 
-                # Split UIDs and filter out empty strings
-                uids = [uid for uid in uids_str.split() if uid.isdigit()]
+        if result and result[1] and result[1][0]:
+            # Only the first match is used, so scan for it instead of decoding and splitting the whole result line.
+            response_bytes = result[1][0]
+            if not isinstance(response_bytes, bytes):
+                response_bytes = str(response_bytes).encode()
+            match = SEARCH_RESULT_ID_PATTERN.search(response_bytes)
 
-                if uids:
-                    uid = int(uids[0])
-                    self._logger.info(f"Found message {search_message_id} in folder {folder} with UID {uid}")
-                    return uid
+            if match:
+                uid = int(match.group())
+                self._logger.info(f"Found message {search_message_id} in folder {folder} with UID {uid}")
+                return uid
 
-            return None
-        except Exception:
-            self._logger.exception(f"Error searching for message {search_message_id} in folder {folder}")
-            return None
-
-    def _extract_raw_message_from_fetch_result(self, fetch_result: Any, uid: int, folder: str) -> bytes | None:
-        """
-        Extract raw message bytes from IMAP fetch result.
-
-        Args:
-            fetch_result: The result from IMAP fetch command
-            uid: The UID of the message
-            folder: The folder name
-
-        Returns:
-            Raw message bytes if found, None otherwise
-        """
-        if not fetch_result or not fetch_result[1]:
-            return None
-
-        raw_message = None
-
-        # Handle different possible response structures
-        if len(fetch_result[1]) > 0:
-            # Try to find the actual message content
-            for item in fetch_result[1]:
-                if isinstance(item, (bytes, bytearray)) and len(item) > 100:
-                    # This is likely the message content
-                    raw_message = bytes(item)
-                    break
-                elif isinstance(item, list) and len(item) > 0:
-                    # Check inside nested lists
-                    for nested_item in item:
-                        if isinstance(nested_item, (bytes, bytearray)) and len(nested_item) > 100:
-                            raw_message = bytes(nested_item)
-                            break
-                    if raw_message:
-                        break
-
-        if raw_message is None:
-            self._logger.warning(
-                f"Could not extract message content from fetch result for UID {uid} in folder {folder}"
-            )
-            self._logger.debug(f"Fetch result structure: {type(fetch_result[1])}, length: {len(fetch_result[1])}")
-            if len(fetch_result[1]) > 0:
-                self._logger.debug(
-                    f"First item type: {type(fetch_result[1][0])}, "
-                    f"content: {
-                        (fetch_result[1][0][:200] if hasattr(fetch_result[1][0], '__getitem__') else fetch_result[1][0])
-                    }"
-                )
-
-        return raw_message
+        return None
 
     async def _fetch_message_from_folder(
-        self, connection: IMAP4_SSL, uid: int, folder: str
-    ) -> PythonEmailMessage | None:
+        self, connection: IMAP4_SSL, uid: int, folder: str, include_body: bool = True
+    ) -> tuple[PythonEmailMessage, frozenset[str] | None] | None:
         """
-        Fetch and parse a message from a folder given its UID.
+        Fetch and parse a message from a folder given its UID, along with its flags.
 
         Args:
             connection: IMAP connection object
             uid: The UID of the message to fetch
-            account: The account object
             folder: The folder name
+            include_body: Whether to fetch the whole message or only its header block
 
         Returns:
-            Message object in Nylas format or None if fetch fails
+            Parsed message (headers only when include_body is False) and its flags (None if the server sent none), or
+            None if the server didn't return the message
         """
-        try:
-            # Fetch the message
-            fetch_result = await connection.fetch(str(uid), "(RFC822)")  # type: ignore
-
-            # Extract raw message bytes
-            raw_message = self._extract_raw_message_from_fetch_result(fetch_result, uid, folder)
-            if raw_message is None:
-                return None
-            parsed_message = email.message_from_bytes(raw_message)
-            return parsed_message
+        # The header block alone skips the body and attachments, which are most of a typical message's size.
+        message_parts = MESSAGE_FETCH_ITEMS if include_body else HEADER_FETCH_ITEMS
+        fetch_result = await connection.fetch(str(uid), message_parts)  # type: ignore
 
-        except Exception:
-            self._logger.exception(f"Error fetching message UID {uid} from folder {folder}")
+        raw_message = FetchUtils.parse_fetch_response(fetch_result).get(uid)
+        if raw_message is None:
+            self._logger.warning(f"Could not extract message content from fetch result for UID {uid} in {folder}")
             return None
+        flags = FetchUtils.parse_fetch_flags(fetch_result).get(uid)
+        if not include_body:
+            return FetchUtils.parse_message(raw_message, headers_only=True), flags
+        # A whole message can be megabytes of MIME; parse it off the event loop so other requests keep running.
+        parsed_message = await asyncio.get_running_loop().run_in_executor(None, FetchUtils.parse_message, raw_message)
+        return parsed_message, flags
 
     async def list_messages(
         self, account: Account, folder: str = "INBOX", limit: int = 50, offset: int = 0
@@ -245,42 +366,90 @@ class MessageController:
         messages: list[Message] = []
 
         try:
-            connection = await self._connection_manager.get_connection_or_fail(account, folder)
-
-            # Get all message UIDs
-            result = await connection.search("ALL")
-            if not result or not result[1]:
-                return messages
-
-            uids = result[1][0].decode().split()
-
-            # Apply offset and limit
-            start_idx = offset
-            end_idx = min(offset + limit, len(uids))
-            selected_uids = uids[start_idx:end_idx]
+            connection = await self._connection_manager.acquire_connection(account, folder)
+            primary_fetch_failed = False
+            try:
+                # Get all message UIDs
+                result = await connection.search("ALL")
+                if result and result[1]:
+                    uids = result[1][0].decode().split()
+
+                    # Apply offset and limit
+                    start_idx = offset
+                    end_idx = min(offset + limit, len(uids))
+                    selected_uids = [int(uid) for uid in uids[start_idx:end_idx]]
+
+                    # Split the page into contiguous chunks fetched in parallel: the first on this connection, the rest
+                    # on extra connections to the same folder. Chunks are concatenated in order, keeping UID order.
+                    chunk_count = max(1, min(MAX_PARALLEL_LIST_FETCHES, len(selected_uids) // LIST_FETCH_MIN_CHUNK))
+                    chunk_size = max(1, -(-len(selected_uids) // chunk_count))
+                    chunks = [selected_uids[i : i + chunk_size] for i in range(0, len(selected_uids), chunk_size)]
+                    chunk_results = await asyncio.gather(
+                        self._fetch_messages(connection, account, folder, chunks[0] if chunks else []),
+                        *(self._fetch_messages_on_new_connection(account, folder, chunk) for chunk in chunks[1:]),
+                        return_exceptions=True,
+                    )
+                    for index, (chunk, chunk_result) in enumerate(zip(chunks, chunk_results)):
+                        if isinstance(chunk_result, BaseException):
+                            if index == 0:
+                                primary_fetch_failed = True
+                            chunk_result = await self._refetch_chunk(account, folder, chunk, chunk_result)
+                        messages.extend(chunk_result)
+            except BaseException:
+                await self._connection_manager.close_connection(connection, account)
+                raise
+
+            if primary_fetch_failed:
+                # The page was completed by the retry, but this connection's state is unknown after its failed FETCH,
+                # so it's closed rather than pooled.
+                await self._connection_manager.close_connection(connection, account)
+            else:
+                await self._connection_manager.release_connection(connection, account)
+        except Exception:
+            self._logger.exception(f"Error listing messages for account {account.email}")
 
-            # Fetch messages
-            for uid in selected_uids:
-                try:
-                    fetch_result = await connection.fetch(uid, "(RFC822)")
-                    if fetch_result and fetch_result[1]:
-                        raw_message = fetch_result[1][0][1]
-                        if isinstance(raw_message, bytes):
-                            parsed_message = email.message_from_bytes(raw_message)
-                        else:
-                            parsed_message = email.message_from_string(raw_message)
+        return messages
 
-                        nylas_message = MessageUtils.convert_to_nylas_format(parsed_message, account.uuid, folder)
-                        messages.append(nylas_message)
+    async def _refetch_chunk(
+        self, account: Account, folder: str, uids: list[int], error: BaseException
+    ) -> list[Message]:
+        """Retry a chunk whose parallel fetch failed on a fresh connection, skipping only it if that fails too."""
+        self._logger.warning(f"Fetching {len(uids)} messages from {folder} failed ({error!r}), retrying")
+        try:
+            return await self._fetch_messages_on_new_connection(account, folder, uids)
+        except Exception:
+            self._logger.exception(f"Skipping {len(uids)} messages from {folder} for {account.email} after a retry")
+            return []
 
-                except Exception:
-                    self._logger.exception(f"Failed to process message UID {uid}")
-                    continue
+    async def _fetch_messages_on_new_connection(self, account: Account, folder: str, uids: list[int]) -> list[Message]:
+        """Fetch messages on a separately acquired connection to the folder, pooling it again afterwards."""
+        async with self._connection_manager.pooled_connection(account, folder) as connection:
+            return await self._fetch_messages(connection, account, folder, uids)
 
-            # Close connection instead of releasing back to pool to prevent leaks
-            await self._connection_manager.close_connection(connection, account)
+    async def _fetch_messages(
+        self, connection: IMAP4_SSL, account: Account, folder: str, uids: list[int]
+    ) -> list[Message]:
+        """
+        Fetch and convert messages in a few batched FETCH commands instead of one round trip per message.
 
-        except Exception:
-            self._logger.exception(f"Error listing messages for account {account.email}")
+        Args:
+            connection: A connection with the folder selected
+            account: The account the messages belong to
+            folder: The selected folder
+            uids: Sequence numbers of the messages to fetch, in the order to return them
 
+        Returns:
+            The converted messages; ones that are missing from the response or fail to parse are skipped
+        """
+        messages: list[Message] = []
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(uids), FETCH_BATCH_SIZE):
+            batch = uids[start : start + FETCH_BATCH_SIZE]
+            fetch_result = await connection.fetch(FetchUtils.format_sequence_set(batch), MESSAGE_FETCH_ITEMS)
+            # Parsing a batch is CPU-bound; keep it off the event loop so other requests aren't stalled meanwhile.
+            messages.extend(
+                await loop.run_in_executor(
+                    None, FetchUtils.convert_fetched_messages, fetch_result, batch, account.uuid, folder
+                )
+            )
         return messages
@@ -1,6 +1,7 @@
 import logging
 import secrets
 import time
+from datetime import datetime
 from typing import Any
 
 from app.controllers.notifications.incoming_controller import IncomingNotificationController
@@ -110,8 +111,6 @@ class SubscriptionManager:
 def _iso_to_epoch(iso_timestamp: str | None) -> int:
     if not iso_timestamp:
         return 0
-    from datetime import datetime
-
     try:
         return int(datetime.fromisoformat(iso_timestamp.replace("Z", "+00:00")).timestamp())
     except ValueError:
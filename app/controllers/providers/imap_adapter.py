@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import UTC, datetime
 
@@ -5,6 +6,7 @@ from app.api.payloads.messages import AttachmentData, EmailAddress, Message, Mes
 from app.api.payloads.threads import Thread
 from app.controllers.email.email_controller import EmailController
 from app.controllers.imap.connection import ConnectionManager
+from app.controllers.imap.fetch_utils import FETCH_BATCH_SIZE, MESSAGE_FETCH_ITEMS, FetchUtils
 from app.controllers.imap.folder_utils import FolderUtils
 from app.controllers.providers.base import (
     AttachmentContent,
@@ -43,6 +45,7 @@ class ImapProviderAdapter(ProviderClient):
         return result.message if result else None
 
     async def update_message_unread(self, account: Account, message_id: str, unread: bool) -> Message | None:
+        # The updated message is returned to the API client in full, so its body is needed too.
         result = await self._email_controller.get_message_by_id(account, message_id)
         if result is None:
             return None
@@ -50,8 +53,7 @@ class ImapProviderAdapter(ProviderClient):
         message = result.message
         if unread:
             folder = message.folders[0]
-            connection = await self._connection_manager.get_connection_or_fail(account, folder)
-            try:
+            async with self._connection_manager.pooled_connection(account, folder) as connection:
                 message_uid = result.uid
                 if message_uid is None:
                     search_result = await connection.search(
@@ -62,15 +64,11 @@ class ImapProviderAdapter(ProviderClient):
                 if message_uid is None:
                     raise ProviderError("Could not resolve the IMAP message sequence number.")
                 await connection.store(str(message_uid), "-FLAGS", r"(\Seen)")
-            finally:
-                await self._connection_manager.close_connection(connection, account)
         else:
             thread_id = MessageUtils.format_message_id(message.thread_id)
             folders = await FolderUtils.get_account_folders(self._connection_manager, account)
             for folder in folders:
-                connection = None
-                try:
-                    connection = await self._connection_manager.get_connection_or_fail(account, folder)
+                async with self._connection_manager.pooled_connection(account, folder) as connection:
                     matching_ids: set[str] = set()
                     for criterion in (
                         f'UNSEEN HEADER References "{thread_id}"',
@@ -79,10 +77,9 @@ class ImapProviderAdapter(ProviderClient):
                         matching_ids.update(self._parse_search_ids(await connection.search(criterion)))
                     if matching_ids:
                         await connection.store(",".join(sorted(matching_ids, key=int)), "+FLAGS", r"(\Seen)")
-                finally:
-                    if connection:
-                        await self._connection_manager.close_connection(connection, account)
 
+        # Cached copies of the updated messages still carry their old unread state.
+        self._email_controller.invalidate_cached_messages(account)
         message.unread = unread
         return message
 
@@ -103,43 +100,38 @@ class ImapProviderAdapter(ProviderClient):
         for folder in folders:
             if len(messages) >= params.limit:
                 break
-            connection = None
             try:
-                connection = await self._connection_manager.get_connection_or_fail(account, folder)
-                uids: list[str] = []
-                for criterion in criteria:
-                    result = await connection.search(criterion)  # type: ignore[attr-defined]
-                    if result and result[1] and result[1][0]:
-                        raw = result[1][0]
-                        decoded = raw.decode() if isinstance(raw, bytes) else str(raw)
-                        uids.extend(uid for uid in decoded.split() if uid.isdigit())
-                # Newest first, dedupe, cap.
-                unique_uids = sorted({int(uid) for uid in uids}, reverse=True)[:MAX_UIDS_PER_FOLDER]
-                for uid in unique_uids:
-                    if len(messages) >= params.limit:
-                        break
-                    fetch_result = await connection.fetch(str(uid), "(RFC822)")  # type: ignore[attr-defined]
-                    raw_message = self._extract_raw(fetch_result)
-                    if raw_message is None:
-                        continue
-                    import email as email_lib
-
-                    parsed = email_lib.message_from_bytes(raw_message)
-                    message = MessageUtils.convert_to_nylas_format(parsed, account.uuid, folder)
-                    if message.id in seen_ids:
-                        continue
-                    if not self._matches(message, params):
-                        continue
-                    seen_ids.add(message.id)
-                    messages.append(message)
+                async with self._connection_manager.pooled_connection(account, folder) as connection:
+                    uids: set[int] = set()
+                    for criterion in criteria:
+                        result = await connection.search(criterion)  # type: ignore[attr-defined]
+                        if result and result[1] and result[1][0]:
+                            raw = result[1][0]
+                            # Split the raw bytes as-is; a broad SEARCH can return thousands of ids, not worth decoding.
+                            tokens = raw.split() if isinstance(raw, (bytes, bytearray)) else str(raw).split()
+                            uids.update(int(uid) for uid in tokens if uid.isdigit())
+                    # Newest first, cap.
+                    unique_uids = sorted(uids, reverse=True)[:MAX_UIDS_PER_FOLDER]
+                    # Hydrate in batched FETCHes, asking only for as many messages as are still needed.
+                    while unique_uids and len(messages) < params.limit:
+                        batch_size = min(params.limit - len(messages), FETCH_BATCH_SIZE)
+                        batch, unique_uids = unique_uids[:batch_size], unique_uids[batch_size:]
+                        fetch_result = await connection.fetch(  # type: ignore[attr-defined]
+                            FetchUtils.format_sequence_set(sorted(batch)), MESSAGE_FETCH_ITEMS
+                        )
+                        # Parsing is CPU-bound; keep it off the event loop so other requests aren't stalled meanwhile.
+                        converted = await asyncio.get_running_loop().run_in_executor(
+                            None, FetchUtils.convert_fetched_messages, fetch_result, batch, account.uuid, folder
+                        )
+                        for message in converted:
+                            if message.id in seen_ids:
+                                continue
+                            if not self._matches(message, params):
+                                continue
+                            seen_ids.add(message.id)
+                            messages.append(message)
             except Exception:
                 logger.exception(f"IMAP list_messages failed for {account.email}:{folder}")
-            finally:
-                if connection:
-                    try:
-                        await self._connection_manager.close_connection(connection, account)
-                    except Exception:
-                        pass
 
         messages.sort(key=lambda m: m.date, reverse=True)
         return ListMessagesResult(messages=messages[: params.limit])
@@ -202,18 +194,6 @@ class ImapProviderAdapter(ProviderClient):
             return False
         return True
 
-    def _extract_raw(self, fetch_result: object) -> bytes | None:
-        if not fetch_result or not fetch_result[1]:  # type: ignore[index]
-            return None
-        for item in fetch_result[1]:  # type: ignore[index]
-            if isinstance(item, (bytes, bytearray)) and len(item) > 100:
-                return bytes(item)
-            if isinstance(item, list):
-                for nested in item:
-                    if isinstance(nested, (bytes, bytearray)) and len(nested) > 100:
-                        return bytes(nested)
-        return None
-
     async def send_message(
         self,
         account: Account,
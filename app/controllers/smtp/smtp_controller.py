@@ -2,10 +2,14 @@
 SMTP controller for sending emails.
 """
 
+import asyncio
 import logging
 import smtplib
+import time
 from dataclasses import dataclass
+from email import policy
 from email.mime.multipart import MIMEMultipart
+from functools import partial
 from typing import Any
 
 from app.api.payloads.messages import (
@@ -23,12 +27,29 @@ from app.utils.message_utils import MessageUtils
 from app.utils.password import PasswordUtils
 
 
-@dataclass
+# Logged-in SMTP sessions kept per account for later sends, and how long (seconds) an idle one stays pooled. Sessions
+# are retired after MAX_MESSAGES_PER_SMTP_SESSION messages, since servers commonly cap messages per connection.
+MAX_IDLE_SMTP_SESSIONS_PER_ACCOUNT = 2
+SMTP_SESSION_IDLE_TTL = 60
+MAX_MESSAGES_PER_SMTP_SESSION = 100
+
+# Common Sent folder names, in order of preference.
+SENT_FOLDER_NAMES = ("Sent", "SENT", "Sent Items", "Sent Mail", "Sent Messages")
+
+
+@dataclass(frozen=True)
 class _SMTPConfig:
     host: str
     port: int
 
 
+@dataclass
+class _SMTPSession:
+    server: smtplib.SMTP_SSL
+    messages_sent: int = 0
+    released_at: float = 0.0
+
+
 class SMTPException(Exception):
     """Exception raised when an SMTP error occurs."""
 
@@ -50,6 +71,8 @@ class SMTPController:
     def __init__(self, connection_manager: ConnectionManager) -> None:
         self._logger = logging.getLogger(__name__)
         self._connection_manager = connection_manager
+        # Authenticated sessions kept warm per (account email, host, port), most recently released last.
+        self._idle_sessions: dict[tuple[str, str, int], list[_SMTPSession]] = {}
 
     async def send_email(
         self,
@@ -93,24 +116,32 @@ class SMTPController:
 
         smtp_config = self._get_smtp_config(account)
 
-        message = self._create_message(
-            account=account,
-            to=to,
-            subject=subject,
-            body=body,
-            from_=from_,
-            cc=cc,
-            bcc=bcc,
-            reply_to=reply_to,
-            reply_to_message_id=replied_message.message.id if replied_message else None,
-            references=references,
-            attachments=attachments,
+        # Building the MIME tree base64-encodes every attachment, so it runs off the event loop like serializing it.
+        loop = asyncio.get_running_loop()
+        message = await loop.run_in_executor(
+            None,
+            partial(
+                self._create_message,
+                account=account,
+                to=to,
+                subject=subject,
+                body=body,
+                from_=from_,
+                cc=cc,
+                bcc=bcc,
+                reply_to=reply_to,
+                reply_to_message_id=replied_message.message.id if replied_message else None,
+                references=references,
+                attachments=attachments,
+            ),
         )
 
-        message_id = await self._send_smtp_message(account, smtp_config, message, to, cc, bcc)
+        # Serialized once, with the CRLF line endings both SMTP DATA and the Sent-folder APPEND expect.
+        raw_message = await loop.run_in_executor(None, self._serialize, message)
+        message_id = await self._send_smtp_message(account, smtp_config, message, raw_message, to, cc, bcc)
 
         try:
-            sent_folder = await self._save_to_sent_folder(account, message)
+            sent_folder = await self._save_to_sent_folder(account, raw_message)
         except Exception as e:
             self._logger.warning(f"Failed to save sent message to Sent folder: {e}")
 
@@ -144,6 +175,11 @@ class SMTPController:
 
     async def login(self, email: str, password: str, host: str, port: int) -> smtplib.SMTP_SSL | None:
         """Login to the SMTP server."""
+        # smtplib blocks for the TLS handshake and AUTH round trips, so run it off the event loop.
+        return await asyncio.get_running_loop().run_in_executor(None, self._login, email, password, host, port)
+
+    def _login(self, email: str, password: str, host: str, port: int) -> smtplib.SMTP_SSL | None:
+        """Open an SMTP session and authenticate it (blocking)."""
         try:
             server = smtplib.SMTP_SSL(host, port)
             response = server.login(email, password)
@@ -204,20 +240,14 @@ class SMTPController:
         account: Account,
         smtp_config: _SMTPConfig,
         message: MIMEMultipart,
+        raw_message: bytes,
         to: list[EmailAddress],
         cc: list[EmailAddress] | None = None,
         bcc: list[EmailAddress] | None = None,
     ) -> str:
         """Send message via SMTP."""
         try:
-            server = await self.login(
-                account.email,
-                password=PasswordUtils.decrypt_password(account.credentials),
-                host=smtp_config.host,
-                port=smtp_config.port,
-            )
-            if not server:
-                raise SMTPException("Failed to login to SMTP server")
+            session = await self._acquire_session(account, smtp_config)
 
             # Prepare recipient list
             recipients = [addr.email for addr in to]
@@ -226,9 +256,15 @@ class SMTPController:
             if bcc:
                 recipients.extend([addr.email for addr in bcc])
 
-            text = message.as_string()
-            server.sendmail(account.email, recipients, text)
-            server.quit()
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, session.server.sendmail, account.email, recipients, raw_message)
+            except Exception:
+                # The session's state is unknown after a failed send, so it isn't pooled again.
+                await loop.run_in_executor(None, self._close_session, session.server)
+                raise
+            session.messages_sent += 1
+            await self._release_session(account, smtp_config, session)
 
             # Extract Message-ID from headers (now guaranteed to exist)
             message_id = message["Message-ID"]
@@ -238,39 +274,78 @@ class SMTPController:
         except Exception as e:
             raise SMTPException(f"Failed to send email: {e}")
 
-    async def _save_to_sent_folder(self, account: Account, message: MIMEMultipart) -> str | None:
-        """Save a copy of the sent message to the Sent folder via IMAP."""
-        # Common Sent folder names to try
-        sent_folder_names = ["Sent", "SENT", "Sent Items", "Sent Mail", "Sent Messages"]
+    async def _acquire_session(self, account: Account, smtp_config: _SMTPConfig) -> _SMTPSession:
+        """Get a logged-in SMTP session for the account, reusing a pooled one that still answers NOOP."""
+        loop = asyncio.get_running_loop()
+        pool = self._idle_sessions.get((account.email, smtp_config.host, smtp_config.port))
+        expires_before = time.monotonic() - SMTP_SESSION_IDLE_TTL
+        while pool:
+            session = pool.pop()
+            if session.released_at >= expires_before:
+                if await loop.run_in_executor(None, self._is_alive, session.server):
+                    self._logger.debug(f"Reusing pooled SMTP session for {account.email}")
+                    return session
+            await loop.run_in_executor(None, self._close_session, session.server)
+
+        server = await self.login(
+            account.email,
+            password=PasswordUtils.decrypt_password(account.credentials),
+            host=smtp_config.host,
+            port=smtp_config.port,
+        )
+        if not server:
+            raise SMTPException("Failed to login to SMTP server")
+        return _SMTPSession(server=server)
+
+    async def _release_session(self, account: Account, smtp_config: _SMTPConfig, session: _SMTPSession) -> None:
+        """Return a session to the account's pool, closing it instead if it's used up or the pool is full."""
+        pool = self._idle_sessions.setdefault((account.email, smtp_config.host, smtp_config.port), [])
+        if session.messages_sent >= MAX_MESSAGES_PER_SMTP_SESSION or len(pool) >= MAX_IDLE_SMTP_SESSIONS_PER_ACCOUNT:
+            await asyncio.get_running_loop().run_in_executor(None, self._close_session, session.server)
+            return
+        session.released_at = time.monotonic()
+        pool.append(session)
+
+    @staticmethod
+    def _serialize(message: MIMEMultipart) -> bytes:
+        """Serialize a message with CRLF line endings (blocking, and CPU-bound for large attachments)."""
+        return message.as_bytes(policy=policy.SMTP)
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP_SSL) -> bool:
+        """Whether a pooled session still answers NOOP (blocking)."""
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
 
+    @staticmethod
+    def _close_session(server: smtplib.SMTP_SSL) -> None:
+        """Send QUIT and close the socket, ignoring a session the server already dropped (blocking)."""
         try:
-            # Use FolderUtils to get all folders for the account
-            all_folders = await FolderUtils.get_account_folders(self._connection_manager, account)
+            server.quit()
+        except Exception:
+            server.close()
 
-            # Find the first matching Sent folder
-            sent_folder = None
-            for folder_name in sent_folder_names:
-                if folder_name in all_folders:
-                    sent_folder = folder_name
-                    break
+    async def _save_to_sent_folder(self, account: Account, raw_message: bytes) -> str | None:
+        """Save a copy of the sent message to the Sent folder via IMAP."""
+        try:
+            # The folder list is cached by FolderUtils, so this only LISTs on the first send in a while.
+            all_folders = set(await FolderUtils.get_account_folders(self._connection_manager, account))
+            sent_folder = next((folder_name for folder_name in SENT_FOLDER_NAMES if folder_name in all_folders), None)
 
             if not sent_folder:
                 self._logger.warning("No existing sent folder found")
                 return None
 
-            connection = await self._connection_manager.get_connection(account)
-            if not connection:
-                self._logger.warning(f"Could not get IMAP connection for account {account.id} to save to Sent folder")
-                return None
+            async with self._connection_manager.pooled_connection(account) as connection:
+                response = await connection.append(raw_message, sent_folder, flags="\\Seen")
 
-            try:
-                # IMAP requires CRLF line endings, not just LF
-                message_string = message.as_string()
-                # Convert LF to CRLF for IMAP
-                message_string = message_string.replace("\n", "\r\n")
-                await connection.append(message_string.encode("utf-8"), sent_folder, flags="\\Seen")
-            finally:
-                await self._connection_manager.close_connection(connection, account)
+            if response.result != "OK":
+                # The cached folder list may name a folder that has since been renamed or deleted.
+                FolderUtils.invalidate_account_folders(account)
+                self._logger.error(f"Failed to save message to Sent folder {sent_folder}: {response.result}")
+                return None
 
             return sent_folder
 
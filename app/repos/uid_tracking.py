@@ -1,3 +1,4 @@
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql import func
 
 from app.models import UidTracking
@@ -18,23 +19,22 @@ class UidTrackingRepo(BaseRepo[UidTracking]):
         uid_tracking = result.one_or_none()
         return uid_tracking.last_seen_uid if uid_tracking else None
 
-    async def update_last_seen_uid(self, account_id: int, folder: str, uid: int) -> UidTracking:
-        """Update the last seen UID for an account/folder combination."""
-        tracking_result = await self.execute(
-            self.base_stmt.where(UidTracking.account_id == account_id, UidTracking.folder == folder)
+    async def update_last_seen_uid(self, account_id: int, folder: str, uid: int) -> None:
+        """Update the last seen UID for an account/folder combination in a single upsert."""
+        stmt = insert(UidTracking).values(account_id=account_id, folder=folder, last_seen_uid=uid)
+
+        # Only move forward: GREATEST keeps the stored UID if it's already past this one.
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["account_id", "folder"],
+            set_={
+                "last_seen_uid": func.greatest(UidTracking.last_seen_uid, stmt.excluded.last_seen_uid),
+                "last_checked_at": func.now(),
+                # onupdate only fires for ORM/Core UPDATEs, not ON CONFLICT DO UPDATE, so bump it explicitly.
+                "updated_at": func.now(),
+            },
         )
-        tracking = tracking_result.one_or_none()
-
-        if tracking:
-            # Only update if the new UID is greater
-            if uid > tracking.last_seen_uid:
-                tracking.last_seen_uid = uid
-                tracking.last_checked_at = func.now()
-        else:
-            tracking = UidTracking(account_id=account_id, folder=folder, last_seen_uid=uid)
-            await self.add(tracking)
-
-        return tracking
+
+        await self._db.session.execute(stmt)
 
     async def delete_all_by_account(self, account_id: int) -> int:
         """Delete all uid_tracking records for a specific account."""
@@ -1,52 +1,75 @@
 import logging
+import re
 import time
 from email.headerregistry import Address
 from email.message import Message as PythonEmailMessage
 from email.utils import getaddresses, mktime_tz, parsedate_tz
+from functools import lru_cache
 from uuid import UUID
 
 from app.api.payloads.messages import EmailAddress, Message, MessageAttachment
 
 logger = logging.getLogger(__name__)
 
+# A single `Display Name <local@domain>` or bare `local@domain` entry of an address list.
+SIMPLE_ADDRESS_PATTERN = re.compile(r"\s*(?:([^<>@]*?)\s*<([^<>@\s]+@[^<>@\s]+)>|([^<>@\s]+@[^<>@\s]+))\s*$")
+# Address-list syntax the fast path leaves to `getaddresses`: quoted strings, comments, groups, escapes, routes.
+COMPLEX_ADDRESS_CHARS = frozenset('"()\\:;[]')
+
+# Charset labels (as normalized by get_content_charset) for plain ASCII, decoded as UTF-8 instead.
+ASCII_CHARSETS = frozenset({"us-ascii", "ascii", "ansi_x3.4-1968"})
+
+# Content-Transfer-Encodings whose decoded payload is the payload itself ("" when the header is absent).
+IDENTITY_TRANSFER_ENCODINGS = frozenset({"", "7bit", "8bit", "binary"})
+
+# Line breaks and padding whitespace that may appear inside a base64 body and don't encode any data.
+BASE64_WHITESPACE = ("\r", "\n", " ", "\t")
+
+# Distinct Date headers whose timestamps are remembered; the same messages are converted again on every listing.
+DATE_CACHE_SIZE = 4096
+# Distinct address headers too complex for the fast path whose parsed (name, address) pairs are remembered; the same
+# senders (mailing lists, notification bots) recur across listings.
+ADDRESS_CACHE_SIZE = 4096
+
+# A `<...>` Message-ID in a References header, whether separated by whitespace, commas or nothing at all.
+REFERENCE_PATTERN = re.compile(r"<[^<>\s]+>")
+
 
 class MessageUtils:
     """Utility class for converting IMAP messages to Nylas Message format."""
 
     @staticmethod
-    def convert_to_nylas_format(msg: PythonEmailMessage, grant_id: UUID, folder: str) -> Message:
-        """Convert Python email message to Nylas Message format."""
+    def convert_to_nylas_format(
+        msg: PythonEmailMessage, grant_id: UUID, folder: str, flags: frozenset[str] | None = None
+    ) -> Message:
+        """
+        Convert Python email message to Nylas Message format.
+
+        Args:
+            msg: The email message to convert
+            grant_id: The grant the message belongs to
+            folder: The folder the message was fetched from
+            flags: The message's IMAP flags; when unknown the message is reported as unread and not starred
+        """
 
         # Extract basic headers
-        subject = msg.get("Subject") or ""
-        message_id = msg.get("Message-ID") or ""
-        date_header = msg.get("Date") or ""
+        subject = MessageUtils.get_header(msg, "Subject")
+        message_id = MessageUtils.get_header(msg, "Message-ID")
+        date_header = MessageUtils.get_header(msg, "Date")
 
-        try:
-            if date_header:
-                date_tuple = parsedate_tz(date_header)
-                if date_tuple:
-                    timestamp = int(mktime_tz(date_tuple))
-                else:
-                    timestamp = int(time.time())
-            else:
-                timestamp = int(time.time())
-        except Exception:
-            timestamp = int(time.time())
+        timestamp = MessageUtils.parse_date(date_header)
 
-        from_header = msg.get("From")
-        from_addresses = MessageUtils.parse_addresses(str(from_header) if from_header else "")  # type: ignore
-        to_header = msg.get("To")
-        to_addresses = MessageUtils.parse_addresses(str(to_header) if to_header else "")  # type: ignore
-        body = MessageUtils.extract_body(msg)
+        from_addresses = MessageUtils.parse_addresses(MessageUtils.get_header(msg, "From"))
+        to_addresses = MessageUtils.parse_addresses(MessageUtils.get_header(msg, "To"))
+        body, attachments = MessageUtils.extract_body_and_attachments(msg)
         references = MessageUtils.parse_references(msg)
         snippet = body[:100] + "..." if len(body) > 100 else body  # Create snippet from body (first 100 chars)
-        attachments = MessageUtils.extract_attachments(msg)
         folders = [folder]
 
-        return Message(
-            starred=False,  # Default to false, could be enhanced with IMAP flags
-            unread=True,  # Default to true, could be enhanced with IMAP flags
+        # Every field is built from strings and ints produced above, so pydantic validation is skipped.
+        return Message.model_construct(
+            starred=flags is not None and "\\Flagged" in flags,
+            unread=flags is None or "\\Seen" not in flags,
             folders=folders,
             grant_id=str(grant_id),
             date=timestamp,
@@ -62,57 +85,109 @@ class MessageUtils:
         )
 
     @staticmethod
-    def extract_body(msg: PythonEmailMessage) -> str:
-        """Extract the body text from an email message."""
-        body = ""
-
-        if msg.is_multipart():
-            for part in msg.walk():
-                content_type = part.get_content_type()
-                content_disposition = str(part.get("Content-Disposition", ""))
-
-                # Skip attachments
-                if "attachment" in content_disposition:
-                    continue
-
-                if content_type == "text/html":
-                    payload = part.get_payload(decode=True)
-                    if payload:
-                        if isinstance(payload, bytes):
-                            charset = part.get_content_charset() or "utf-8"
-                            try:
-                                body = payload.decode(charset)
-                            except UnicodeDecodeError:
-                                body = payload.decode("utf-8", errors="ignore")
-                        else:
-                            body = str(payload)
-                        break
-                elif content_type == "text/plain" and not body:
-                    # Use plain text as fallback if no HTML.
-                    payload = part.get_payload(decode=True)
-                    if payload:
-                        if isinstance(payload, bytes):
-                            charset = part.get_content_charset() or "utf-8"
-                            try:
-                                body = payload.decode(charset)
-                            except UnicodeDecodeError:
-                                body = payload.decode("utf-8", errors="ignore")
-                        else:
-                            body = str(payload)
-        else:
-            # Single part message
-            payload = msg.get_payload(decode=True)
-            if payload:
-                if isinstance(payload, bytes):
-                    charset = msg.get_content_charset() or "utf-8"
+    def get_header(msg: PythonEmailMessage, name: str) -> str:
+        """
+        Get a header's value as a plain string ("" when absent).
+
+        Headers carrying raw 8-bit bytes (RFC 6532 UTF-8 headers) come back from the compat32 policy as `Header`
+        objects whose `str()` is mojibake, so their raw value is decoded as UTF-8 instead.
+        """
+        value = msg.get(name)
+        if value is None or isinstance(value, str):
+            return value or ""
+
+        lowered_name = name.lower()
+        raw_value = next((raw for key, raw in msg.raw_items() if key.lower() == lowered_name), "")
+        return str(raw_value).encode("ascii", "surrogateescape").decode("utf-8", "replace")
+
+    @staticmethod
+    def parse_date(date_header: str) -> int:
+        """Parse an RFC 2822 Date header into a Unix timestamp, using the current time if it's missing or invalid."""
+        timestamp = MessageUtils._parse_date_header(date_header) if date_header else None
+        return int(time.time()) if timestamp is None else timestamp
+
+    @staticmethod
+    @lru_cache(maxsize=DATE_CACHE_SIZE)
+    def _parse_date_header(date_header: str) -> int | None:
+        """Memoized Date header parsing; None for invalid dates, so the "now" fallback is never cached."""
+        try:
+            date_tuple = parsedate_tz(date_header)
+            if date_tuple:
+                # Dates without a zone are taken as UTC, per RFC 2822's "-0000".
+                return int(mktime_tz(date_tuple))
+        except Exception:
+            pass
+        return None
+
+    @staticmethod
+    def extract_body_and_attachments(msg: PythonEmailMessage) -> tuple[str, list[MessageAttachment]]:
+        """
+        Extract the body text and attachment metadata from an email message in a single walk of its MIME tree.
+
+        The body is the first non-empty text/html part, falling back to the first non-empty text/plain part.
+
+        Args:
+            msg: The email message to extract from
+
+        Returns:
+            The stripped body text and the message's attachments
+        """
+        if not msg.is_multipart():
+            return MessageUtils._decode_text_payload(msg).strip(), []
+
+        html_body = ""
+        plain_body = ""
+        attachments: list[MessageAttachment] = []
+        attachment_index = 0
+        for part in msg.walk():
+            content_disposition = str(part.get("Content-Disposition", ""))
+
+            if "attachment" in content_disposition:
+                filename = part.get_filename()
+                if filename:
+                    # Ids are positional, matching extract_attachment_content, so count the part even if it fails.
+                    attachment_index += 1
+                    attachment_id = f"att_{attachment_index}"
                     try:
-                        body = payload.decode(charset)
-                    except UnicodeDecodeError:
-                        body = payload.decode("utf-8", errors="ignore")
-                else:
-                    body = str(payload)
+                        attachments.append(
+                            MessageAttachment.model_construct(
+                                id=attachment_id,
+                                filename=filename,
+                                size=MessageUtils.decoded_payload_size(part),
+                                content_type=part.get_content_type(),
+                                is_inline=False,
+                            )
+                        )
+                    except Exception:
+                        logger.exception(f"Failed to extract attachment {attachment_id}")
+                continue
+
+            content_type = part.get_content_type()
+            if content_type == "text/html" and not html_body:
+                html_body = MessageUtils._decode_text_payload(part)
+            elif content_type == "text/plain" and not plain_body:
+                plain_body = MessageUtils._decode_text_payload(part)
+
+        return (html_body or plain_body).strip(), attachments
 
-        return body.strip()
+    @staticmethod
+    def _decode_text_payload(part: PythonEmailMessage) -> str:
+        """Decode a text part's payload with its declared charset, falling back to lenient UTF-8."""
+        payload = part.get_payload(decode=True)
+        if not payload:
+            return ""
+        if not isinstance(payload, bytes):
+            return str(payload)
+
+        charset = part.get_content_charset() or "utf-8"
+        if charset in ASCII_CHARSETS:
+            # UTF-8 is a superset of ASCII, and 8-bit text mislabelled as ASCII is nearly always UTF-8.
+            charset = "utf-8"
+        # errors="replace" never raises, so a bad byte costs one replacement character rather than a second decode.
+        try:
+            return payload.decode(charset, errors="replace")
+        except LookupError:
+            return payload.decode("utf-8", errors="replace")
 
     @staticmethod
     def parse_references(msg: PythonEmailMessage) -> list[str]:
@@ -123,20 +198,11 @@ class MessageUtils:
             msg: The email message to parse
 
         Returns:
-            List of referenced Message-IDs (including angle brackets)
+            List of referenced Message-IDs (including angle brackets), from In-Reply-To when References is absent
         """
-        references: list[str] = []
-
-        references_header = msg.get("References")
-        if references_header:
-            # References are separated by whitespace
-            ref_ids = references_header.split()
-            for ref_id in ref_ids:
-                ref_id = ref_id.strip()
-                if ref_id and ref_id.startswith("<") and ref_id.endswith(">"):
-                    references.append(ref_id)
-
-        return references
+        # Some clients only set In-Reply-To; RFC 5322 has replies to those carry it forward as their References.
+        references = MessageUtils.get_header(msg, "References") or MessageUtils.get_header(msg, "In-Reply-To")
+        return REFERENCE_PATTERN.findall(references)
 
     @staticmethod
     def parse_addresses(address_string: str) -> list[EmailAddress]:
@@ -144,19 +210,51 @@ class MessageUtils:
         if not address_string:
             return []
 
+        fast_result = MessageUtils._parse_simple_addresses(address_string)
+        if fast_result is not None:
+            return fast_result
+
         try:
-            addresses = getaddresses([address_string])
+            addresses = MessageUtils._get_addresses(address_string)
             result: list[EmailAddress] = []
 
             for name, email_addr in addresses:
                 if email_addr:
-                    result.append(EmailAddress(name=name or email_addr, email=email_addr))
+                    result.append(EmailAddress.model_construct(name=name or email_addr, email=email_addr))
 
             return result
         except Exception:
             logger.exception(f"Failed to parse addresses '{address_string}'")
             return []
 
+    @staticmethod
+    @lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+    def _get_addresses(address_string: str) -> tuple[tuple[str, str], ...]:
+        """Memoized `getaddresses`; the pairs are immutable so callers build fresh EmailAddress objects from them."""
+        return tuple(getaddresses([address_string]))
+
+    @staticmethod
+    def _parse_simple_addresses(address_string: str) -> list[EmailAddress] | None:
+        """
+        Parse a plain comma-separated list of `Name <addr>` / `addr` entries without the full RFC 5322 parser.
+
+        Returns None when the header uses syntax only `getaddresses` handles (quoting, comments, groups, encoded words).
+        """
+        if any(char in address_string for char in COMPLEX_ADDRESS_CHARS) or "=?" in address_string:
+            return None
+
+        result: list[EmailAddress] = []
+        for entry in address_string.split(","):
+            match = SIMPLE_ADDRESS_PATTERN.match(entry)
+            if match is None:
+                return None
+            name, angle_addr, bare_addr = match.groups()
+            email_addr = angle_addr or bare_addr
+            # getaddresses joins the display name's words with single spaces.
+            name = " ".join(name.split()) if name else ""
+            result.append(EmailAddress.model_construct(name=name or email_addr, email=email_addr))
+        return result
+
     @staticmethod
     def format_message_id(message_id: str) -> str:
         """Format a message ID to include angle brackets."""
@@ -174,37 +272,24 @@ class MessageUtils:
         return [Address(display_name=addr.name or addr.email, addr_spec=addr.email) for addr in addresses]
 
     @staticmethod
-    def extract_attachments(msg: PythonEmailMessage) -> list[MessageAttachment]:
-        """Extract attachments from an email message."""
-        attachments = []
-
-        try:
-            if msg.is_multipart():
-                attachment_index = 1
-                for part in msg.walk():
-                    content_disposition = str(part.get("Content-Disposition", ""))
-
-                    if "attachment" in content_disposition:
-                        filename = part.get_filename()
-                        if filename:
-                            content_type = part.get_content_type()
-                            payload = part.get_payload(decode=True)
-                            size = len(payload) if payload else 0
-
-                            attachment = MessageAttachment(
-                                id=f"att_{attachment_index}",
-                                filename=filename,
-                                size=size,
-                                content_type=content_type,
-                                is_inline=False,
-                            )
-                            attachments.append(attachment)
-                            attachment_index += 1
-
-        except Exception:
-            logger.exception("Failed to extract attachments")
-
-        return attachments
+    def decoded_payload_size(part: PythonEmailMessage) -> int:
+        """Size of a part's decoded payload, computed from the encoded text instead of decoding it where possible."""
+        payload = part.get_payload()
+        if isinstance(payload, str):
+            transfer_encoding = part.get("Content-Transfer-Encoding", "").strip().lower()
+            if transfer_encoding == "base64":
+                encoded_length = len(payload) - sum(payload.count(char) for char in BASE64_WHITESPACE)
+                if encoded_length % 4 == 0:
+                    tail = payload.rstrip()
+                    padding = 2 if tail.endswith("==") else 1 if tail.endswith("=") else 0
+                    return max(encoded_length // 4 * 3 - padding, 0)
+            elif transfer_encoding in IDENTITY_TRANSFER_ENCODINGS and payload.isascii():
+                # Decoding an identity-encoded ASCII payload is just str -> bytes, one byte per character.
+                return len(payload)
+
+        # Quoted-printable, 8-bit text, or malformed base64 whose decoded size depends on how the decoder recovers.
+        decoded = part.get_payload(decode=True)
+        return len(decoded) if isinstance(decoded, bytes) else 0
 
     @staticmethod
     def extract_attachment_content(msg: PythonEmailMessage, attachment_id: str) -> bytes | None:
@@ -34,6 +34,13 @@ class IMAPSettings(BaseSettings):
     poll_interval: int = Field(alias="IMAP_POLL_INTERVAL", default=60)
     poll_jitter_max: int = Field(alias="IMAP_POLL_JITTER", default=30)
     listener_mode: str = Field(alias="IMAP_LISTENER_MODE", default="single")
+    # Process-wide cap on folders polled (and therefore IMAP sockets held) concurrently.
+    max_concurrent_polls: int = Field(alias="IMAP_MAX_CONCURRENT_POLLS", default=100, ge=1)
+    # Per-account cap on folders polled concurrently, to avoid TLS handshake storms against a single mailbox.
+    max_concurrent_polls_per_account: int = Field(alias="IMAP_MAX_CONCURRENT_POLLS_PER_ACCOUNT", default=4, ge=1)
+    # Authenticated connections kept open per account for reuse, and how long (seconds) an idle one stays pooled.
+    max_idle_connections_per_account: int = Field(alias="IMAP_MAX_IDLE_CONNECTIONS_PER_ACCOUNT", default=4, ge=0)
+    connection_idle_ttl: int = Field(alias="IMAP_CONNECTION_IDLE_TTL", default=300, ge=0)
 
 
 class WebhookSettings(BaseSettings):
@@ -0,0 +1,113 @@
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.controllers.imap.connection import ConnectionManager
+
+
+def _make_connection(state: str = "SELECTED") -> Mock:
+    connection = Mock()
+    connection.get_state.return_value = state
+    connection.logout = AsyncMock()
+    return connection
+
+
+@pytest.fixture(autouse=True)
+def _pool_settings() -> Iterator[None]:
+    with patch("app.controllers.imap.connection.settings.imap.max_idle_connections_per_account", 2), patch(
+        "app.controllers.imap.connection.settings.imap.connection_idle_ttl", 300
+    ):
+        yield
+
+
+class TestConnectionPool:
+    @pytest.mark.asyncio
+    async def test_released_connection_is_reused(self) -> None:
+        manager = ConnectionManager()
+        account = Mock(email="a@b.co")
+        connection = _make_connection()
+
+        await manager.release_connection(connection, account)
+        with patch.object(manager, "get_connection_or_fail", AsyncMock()) as get_connection:
+            assert await manager.acquire_connection(account) is connection
+            get_connection.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_logged_out_connection_is_not_pooled(self) -> None:
+        manager = ConnectionManager()
+        account = Mock(email="a@b.co")
+        connection = _make_connection(state="LOGOUT")
+
+        await manager.release_connection(connection, account)
+
+        connection.logout.assert_awaited_once()
+        assert manager._idle_connections["a@b.co"] == []
+
+    @pytest.mark.asyncio
+    async def test_full_pool_closes_extra_connections(self) -> None:
+        manager = ConnectionManager()
+        account = Mock(email="a@b.co")
+        connections = [_make_connection() for _ in range(3)]
+
+        for connection in connections:
+            await manager.release_connection(connection, account)
+
+        assert len(manager._idle_connections["a@b.co"]) == 2
+        connections[2].logout.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_connection_is_replaced(self) -> None:
+        manager = ConnectionManager()
+        account = Mock(email="a@b.co")
+        stale = _make_connection()
+        fresh = _make_connection()
+
+        await manager.release_connection(stale, account)
+        manager._idle_connections["a@b.co"][0].released_at -= 301
+        with patch.object(manager, "get_connection_or_fail", AsyncMock(return_value=fresh)):
+            assert await manager.acquire_connection(account) is fresh
+
+        stale.logout.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_long_idle_connection_is_probed_before_reuse(self) -> None:
+        manager = ConnectionManager()
+        account = Mock(email="a@b.co")
+        stale = _make_connection()
+        stale.noop = AsyncMock(side_effect=ConnectionResetError)
+        fresh = _make_connection()
+
+        await manager.release_connection(stale, account)
+        manager._idle_connections["a@b.co"][0].released_at -= 61
+        with patch.object(manager, "get_connection_or_fail", AsyncMock(return_value=fresh)):
+            assert await manager.acquire_connection(account) is fresh
+
+        stale.logout.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_pooled_connection_is_released_after_block(self) -> None:
+        manager = ConnectionManager()
+        account = Mock(email="a@b.co")
+        connection = _make_connection()
+
+        with patch.object(manager, "get_connection_or_fail", AsyncMock(return_value=connection)):
+            async with manager.pooled_connection(account) as pooled:
+                assert pooled is connection
+
+        assert [idle.connection for idle in manager._idle_connections["a@b.co"]] == [connection]
+
+    @pytest.mark.asyncio
+    async def test_pooled_connection_is_closed_when_block_fails(self) -> None:
+        manager = ConnectionManager()
+        account = Mock(email="a@b.co")
+        connection = _make_connection()
+
+        with patch.object(manager, "get_connection_or_fail", AsyncMock(return_value=connection)), pytest.raises(
+            TimeoutError
+        ):
+            async with manager.pooled_connection(account):
+                raise TimeoutError
+
+        connection.logout.assert_awaited_once()
+        assert not manager._idle_connections.get("a@b.co")
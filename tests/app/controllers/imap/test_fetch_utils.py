@@ -0,0 +1,138 @@
+from unittest.mock import Mock, patch
+
+from aioimaplib import Response
+
+from app.controllers.imap.fetch_utils import FetchUtils
+
+
+class TestParseFetchResponse:
+    def test_uses_sequence_number_without_uid(self) -> None:
+        response = Response(
+            "OK",
+            [b"1 FETCH (RFC822 {5}", bytearray(b"hello"), b")", b"2 FETCH (RFC822 {5}", bytearray(b"world"), b")"],
+        )
+
+        messages = FetchUtils.parse_fetch_response(response)
+
+        assert messages == {1: b"hello", 2: b"world"}
+
+    def test_prefers_uid_over_sequence_number(self) -> None:
+        response = Response("OK", [b"3 FETCH (UID 42 RFC822 {5}", bytearray(b"hello"), b")", b"FETCH completed."])
+
+        messages = FetchUtils.parse_fetch_response(response)
+
+        assert messages == {42: b"hello"}
+
+    def test_parses_body_literal_after_flags(self) -> None:
+        response = Response(
+            "OK", [b"4 FETCH (FLAGS (\\Seen) BODY[] {5}", bytearray(b"hello"), b")", b"FETCH completed."]
+        )
+
+        messages = FetchUtils.parse_fetch_response(response)
+
+        assert messages == {4: b"hello"}
+
+    def test_slices_payload_to_announced_literal_size(self) -> None:
+        response = Response("OK", [b"1 FETCH (RFC822 {5}", bytearray(b"hello)\r\n"), b"FETCH completed."])
+
+        messages = FetchUtils.parse_fetch_response(response)
+
+        assert messages == {1: b"hello"}
+
+    def test_does_not_scan_literals_for_fetch_headers(self) -> None:
+        body = bytearray(b"9 FETCH (RFC822 {1}")
+        response = Response(
+            "OK", [b"1 FETCH (RFC822 {%d}" % len(body), body, b")", b"2 FETCH (RFC822 {1}", bytearray(b"x"), b")"]
+        )
+
+        messages = FetchUtils.parse_fetch_response(response)
+
+        assert messages == {1: body, 2: b"x"}
+
+    def test_ignores_lines_without_literal(self) -> None:
+        response = Response("OK", [b"3 FETCH (FLAGS (\\Seen))", b"FETCH completed."])
+
+        assert FetchUtils.parse_fetch_response(response) == {}
+
+
+class TestParseFetchFlags:
+    def test_reads_flags_before_or_after_literal(self) -> None:
+        response = Response(
+            "OK",
+            [
+                b"1 FETCH (FLAGS (\\Seen \\Flagged) UID 41 BODY[] {5}",
+                bytearray(b"hello"),
+                b")",
+                b"2 FETCH (UID 42 BODY[] {5}",
+                bytearray(b"world"),
+                b" FLAGS ())",
+                b"FETCH completed.",
+            ],
+        )
+
+        assert FetchUtils.parse_fetch_flags(response) == {41: {"\\Seen", "\\Flagged"}, 42: frozenset()}
+
+    def test_does_not_take_flags_from_next_message(self) -> None:
+        response = Response(
+            "OK",
+            [b"1 FETCH (BODY[] {5}", bytearray(b"hello"), b"2 FETCH (FLAGS (\\Seen) BODY[] {1}", bytearray(b"x"), b")"],
+        )
+
+        assert FetchUtils.parse_fetch_flags(response) == {2: {"\\Seen"}}
+
+
+class TestConvertFetchedMessages:
+    @staticmethod
+    def _make_response() -> Response:
+        first = bytearray(b"Message-ID: <a@x>\r\nSubject: First\r\n\r\nhello")
+        second = bytearray(b"Message-ID: <b@x>\r\nSubject: Second\r\n\r\nworld")
+        return Response(
+            "OK",
+            [
+                b"1 FETCH (FLAGS (\\Seen) BODY[] {%d}" % len(first),
+                first,
+                b")",
+                b"2 FETCH (FLAGS () BODY[] {%d}" % len(second),
+                second,
+                b")",
+            ],
+        )
+
+    def test_converts_in_requested_order_with_flags(self) -> None:
+        messages = FetchUtils.convert_fetched_messages(self._make_response(), [2, 3, 1], "grant", "INBOX")
+
+        assert [(message.id, message.unread) for message in messages] == [("<b@x>", True), ("<a@x>", False)]
+
+    def test_skips_messages_that_fail_to_convert(self) -> None:
+        with patch(
+            "app.controllers.imap.fetch_utils.MessageUtils.convert_to_nylas_format", side_effect=[ValueError, Mock()]
+        ):
+            messages = FetchUtils.convert_fetched_messages(self._make_response(), [1, 2], "grant", "INBOX")
+
+        assert len(messages) == 1
+
+
+class TestFormatSequenceSet:
+    def test_collapses_contiguous_runs(self) -> None:
+        assert FetchUtils.format_sequence_set([1, 2, 3, 5, 7, 8]) == "1:3,5,7:8"
+
+    def test_single_uid(self) -> None:
+        assert FetchUtils.format_sequence_set([42]) == "42"
+
+
+class TestParseMessage:
+    def test_parses_literal_view(self) -> None:
+        raw = bytearray(b"Message-ID: <a@b.co>\r\nSubject: Hi\r\n\r\nbody\xe9")
+
+        message = FetchUtils.parse_message(memoryview(raw))
+
+        assert message["Message-ID"] == "<a@b.co>"
+        assert message.get_payload(decode=True) == b"body\xe9"
+
+    def test_headers_only_leaves_body_unparsed(self) -> None:
+        raw = b"Message-ID: <a@b.co>\r\nSubject: Hi\r\n\r\n--boundary\r\nbody"
+
+        message = FetchUtils.parse_message(memoryview(raw), headers_only=True)
+
+        assert message["Subject"] == "Hi"
+        assert not message.is_multipart()
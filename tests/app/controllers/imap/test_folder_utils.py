@@ -0,0 +1,84 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.controllers.imap import folder_utils
+from app.controllers.imap.folder_utils import FolderUtils
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        (b'(\\HasNoChildren) "/" INBOX', "INBOX"),
+        (b'(\\Sent \\HasNoChildren) "/" "Sent Items"', "Sent Items"),
+        (b'(\\Archive) "." "Archive"', "Archive"),
+        (b'(\\HasNoChildren) "\\\\" Work', "Work"),
+        (b'(\\HasNoChildren) "/" ""', None),
+        (b'(\\Noselect) NIL ""', None),
+        (b"LIST completed", None),
+    ],
+)
+def test_parse_folder_from_list_response(line: bytes, expected: str | None) -> None:
+    assert FolderUtils.parse_folder_from_list_response(line) == expected
+
+
+class TestGetAccountFolders:
+    @pytest.fixture(autouse=True)
+    def _clear_folder_cache(self) -> Iterator[None]:
+        folder_utils._folder_cache.clear()
+        yield
+        folder_utils._folder_cache.clear()
+
+    @staticmethod
+    def _make_connection_manager() -> Mock:
+        connection = Mock()
+        connection.list = AsyncMock(
+            return_value=Mock(
+                lines=[b'(\\HasNoChildren) "/" INBOX', b'(\\HasNoChildren) "/" "Sent Items"', b"LIST completed"]
+            )
+        )
+
+        @asynccontextmanager
+        async def pooled_connection(account: object) -> AsyncIterator[Mock]:
+            yield connection
+
+        return Mock(pooled_connection=pooled_connection, connection=connection)
+
+    @pytest.mark.asyncio
+    async def test_repeat_lookups_share_one_list(self) -> None:
+        connection_manager = self._make_connection_manager()
+        account = Mock(email="a@b.co")
+
+        results = await asyncio.gather(
+            *(FolderUtils.get_account_folders(connection_manager, account) for _ in range(3))
+        )
+        results.append(await FolderUtils.get_account_folders(connection_manager, account, max_folders=1))
+
+        assert results == [["INBOX", "Sent Items"]] * 3 + [["INBOX"]]
+        connection_manager.connection.list.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_or_invalidated_lists_are_refreshed(self) -> None:
+        connection_manager = self._make_connection_manager()
+        account = Mock(email="a@b.co")
+
+        await FolderUtils.get_account_folders(connection_manager, account)
+        FolderUtils.invalidate_account_folders(account)
+        await FolderUtils.get_account_folders(connection_manager, account)
+        assert connection_manager.connection.list.await_count == 2
+
+        folder_utils._folder_cache["a@b.co"] = (0.0, folder_utils._folder_cache["a@b.co"][1])
+        await FolderUtils.get_account_folders(connection_manager, account)
+        assert connection_manager.connection.list.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_list_falls_back_without_caching(self) -> None:
+        connection_manager = self._make_connection_manager()
+        connection_manager.connection.list.side_effect = [TimeoutError, connection_manager.connection.list.return_value]
+        account = Mock(email="a@b.co")
+
+        assert await FolderUtils.get_account_folders(connection_manager, account) == ["INBOX", "Sent"]
+        assert await FolderUtils.get_account_folders(connection_manager, account) == ["INBOX", "Sent Items"]
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from aioimaplib import Response
+
+from app.controllers.imap.listener import IMAPListener
+
+
+def _make_listener() -> IMAPListener:
+    with patch("app.controllers.imap.listener.settings.imap.max_concurrent_polls", 10):
+        return IMAPListener(
+            connection_health_repo=Mock(),
+            uid_tracking_repo=Mock(),
+            email_repo=Mock(),
+            connection_manager=Mock(),
+            email_processor=Mock(),
+        )
+
+
+class TestParseSearchResponse:
+    def test_collects_uids_and_skips_completion_line(self) -> None:
+        response = Response("OK", [b"1 2 3 15", b"Search completed (0.001 + 0.000 secs)."])
+
+        assert _make_listener()._parse_search_response(response) == [1, 2, 3, 15]
+
+    def test_keeps_uids_on_lines_mentioning_ok(self) -> None:
+        response = Response("OK", [b"4 5 OK"])
+
+        assert _make_listener()._parse_search_response(response) == [4, 5]
+
+    def test_skips_capitalized_completion_line(self) -> None:
+        response = Response("OK", [b"SEARCH 5 6", b"Completed (2 msgs in 0.000 secs)"])
+
+        assert _make_listener()._parse_search_response(response) == [5, 6]
+
+
+class TestParseExists:
+    def test_reads_exists_count(self) -> None:
+        response = Response(
+            "OK",
+            [b"FLAGS (\\Seen \\Answered)", b"12 EXISTS", b"0 RECENT", b"OK [UIDNEXT 4392] Predicted next UID"],
+        )
+
+        assert _make_listener()._parse_exists(response) == 12
+
+    def test_missing_exists(self) -> None:
+        assert _make_listener()._parse_exists(Response("OK", [b"[READ-WRITE] Select completed."])) is None
+
+
+class TestCancelAndWait:
+    @pytest.mark.asyncio
+    async def test_cancels_running_tasks(self) -> None:
+        tasks = [asyncio.create_task(asyncio.sleep(60)) for _ in range(3)]
+
+        pending = await _make_listener()._cancel_and_wait(tasks, timeout=1)
+
+        assert pending == set()
+        assert all(task.cancelled() for task in tasks)
+
+    @pytest.mark.asyncio
+    async def test_returns_tasks_that_ignore_cancellation(self) -> None:
+        release = asyncio.Event()
+
+        async def stubborn() -> None:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                await release.wait()
+
+        task = asyncio.create_task(stubborn())
+        await asyncio.sleep(0)
+
+        pending = await _make_listener()._cancel_and_wait([task], timeout=0.05)
+
+        assert pending == {task}
+        release.set()
+        await task
+
+
+class TestWaitUntil:
+    @pytest.mark.asyncio
+    async def test_returns_true_once_deadline_passes(self) -> None:
+        listener = _make_listener()
+
+        assert await listener._wait_until(time.monotonic() + 0.01) is True
+
+    @pytest.mark.asyncio
+    async def test_wakes_early_on_shutdown(self) -> None:
+        listener = _make_listener()
+        asyncio.get_running_loop().call_later(0.01, listener._shutdown_event.set)
+
+        assert await asyncio.wait_for(listener._wait_until(time.monotonic() + 60), timeout=1) is False
+
+
+class TestStopAccountListeners:
+    @pytest.mark.asyncio
+    async def test_stops_only_that_accounts_listeners(self) -> None:
+        listener = _make_listener()
+        tasks = {key: asyncio.create_task(asyncio.sleep(60)) for key in ("a@b.co:INBOX", "a@b.co:Sent", "c@d.co:INBOX")}
+        listener._active_listeners.update(tasks)
+        listener._listener_keys_by_account["a@b.co"].update({"a@b.co:INBOX", "a@b.co:Sent"})
+        listener._listener_keys_by_account["c@d.co"].add("c@d.co:INBOX")
+
+        await listener.stop_account_listeners("a@b.co")
+
+        assert list(listener._active_listeners) == ["c@d.co:INBOX"]
+        assert tasks["a@b.co:INBOX"].cancelled() and tasks["a@b.co:Sent"].cancelled()
+        assert not tasks["c@d.co:INBOX"].done()
+        tasks["c@d.co:INBOX"].cancel()
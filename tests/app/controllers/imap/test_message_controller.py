@@ -0,0 +1,394 @@
+import asyncio
+from collections.abc import Iterator
+from functools import partial
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.controllers.email.message import MessageResult
+from app.controllers.imap.connection import ConnectionManager
+from app.controllers.imap.fetch_utils import FetchUtils
+from app.controllers.imap.message_controller import MessageController
+from app.utils.message_utils import MessageUtils
+
+
+def _make_connection_manager() -> Mock:
+    connection_manager = Mock(
+        acquire_connection=AsyncMock(), release_connection=AsyncMock(), close_connection=AsyncMock()
+    )
+    connection_manager.pooled_connection = partial(ConnectionManager.pooled_connection, connection_manager)
+    return connection_manager
+
+
+class TestSearchFolders:
+    @pytest.fixture(autouse=True)
+    def _pool_settings(self) -> Iterator[None]:
+        with patch("app.controllers.imap.message_controller.settings.imap.max_idle_connections_per_account", 4):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_returns_first_hit_in_folder_order(self) -> None:
+        controller = MessageController(Mock())
+        found_in: dict[str, object] = {"Archive": Mock(), "Sent": Mock()}
+
+        async def get_message(account: object, message_id: str, folder: str, include_body: bool = True) -> object:
+            # Sent answers first, but Archive comes earlier in the folder list.
+            await asyncio.sleep(0.01 if folder == "Archive" else 0)
+            return found_in.get(folder)
+
+        with patch.object(controller, "_get_message_from_folder", side_effect=get_message):
+            result = await controller._search_folders(Mock(), "<id@x>", ["INBOX", "Archive", "Sent"])
+
+        assert result is found_in["Archive"]
+
+    @pytest.mark.asyncio
+    async def test_cancels_remaining_searches_after_hit(self) -> None:
+        controller = MessageController(Mock())
+        hit = Mock()
+        cancelled: list[str] = []
+
+        async def get_message(account: object, message_id: str, folder: str, include_body: bool = True) -> object:
+            if folder == "INBOX":
+                return hit
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(folder)
+                raise
+            return None
+
+        with patch.object(controller, "_get_message_from_folder", side_effect=get_message):
+            result = await controller._search_folders(Mock(), "<id@x>", ["INBOX", "Archive", "Sent"])
+
+        assert result is hit
+        assert sorted(cancelled) == ["Archive", "Sent"]
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrent_searches(self) -> None:
+        controller = MessageController(Mock())
+        running = 0
+        peak = 0
+
+        async def get_message(account: object, message_id: str, folder: str, include_body: bool = True) -> object:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+            return None
+
+        with patch("app.controllers.imap.message_controller.MAX_PARALLEL_FOLDER_SEARCHES", 2), patch.object(
+            controller, "_get_message_from_folder", side_effect=get_message
+        ):
+            result = await controller._search_folders(Mock(), "<id@x>", [f"Folder{i}" for i in range(6)])
+
+        assert result is None
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_stays_within_connection_pool(self) -> None:
+        controller = MessageController(Mock())
+        running = 0
+        peak = 0
+
+        async def get_message(account: object, message_id: str, folder: str, include_body: bool = True) -> object:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+            return None
+
+        with patch(
+            "app.controllers.imap.message_controller.settings.imap.max_idle_connections_per_account", 3
+        ), patch.object(controller, "_get_message_from_folder", side_effect=get_message):
+            await controller._search_folders(Mock(), "<id@x>", [f"Folder{i}" for i in range(6)])
+
+        assert peak == 3
+
+
+class TestSearchMessageInFolder:
+    @pytest.mark.parametrize(
+        ("search_result", "expected"),
+        [(b"12 40", 12), (b" 7", 7), ("9", 9), (b"SEARCH1 3", 3), (b"", None), (b"abc", None)],
+    )
+    @pytest.mark.asyncio
+    async def test_returns_first_matching_id(self, search_result: bytes | str, expected: int | None) -> None:
+        connection = Mock(search=AsyncMock(return_value=("OK", [search_result])))
+
+        assert await MessageController(Mock())._search_message_in_folder(connection, "<id@x>", "INBOX") == expected
+
+
+class TestFetchMessageFromFolder:
+    @pytest.mark.asyncio
+    async def test_header_only_fetch_peeks_at_headers(self) -> None:
+        controller = MessageController(Mock())
+        headers = b"Message-ID: <id@x>\r\nSubject: Hi\r\n\r\n"
+        connection = Mock()
+        connection.fetch = AsyncMock(
+            return_value=Mock(
+                lines=[b"7 FETCH (FLAGS (\\Seen) BODY[HEADER] {%d}" % len(headers), bytearray(headers), b")"]
+            )
+        )
+
+        fetched = await controller._fetch_message_from_folder(connection, 7, "INBOX", include_body=False)
+
+        connection.fetch.assert_awaited_once_with("7", "(FLAGS BODY.PEEK[HEADER])")
+        assert fetched is not None
+        message, flags = fetched
+        assert message["Subject"] == "Hi"
+        assert message.get_payload() == ""
+        assert flags == {"\\Seen"}
+
+
+class TestGetMessageFromFolder:
+    @pytest.mark.asyncio
+    async def test_searches_folder_when_cached_uid_holds_another_message(self) -> None:
+        connection_manager = _make_connection_manager()
+        controller = MessageController(connection_manager)
+        stale = FetchUtils.parse_message(b"Message-ID: <other@x>\r\n\r\n")
+        current = FetchUtils.parse_message(b"Message-ID: <id@x>\r\n\r\n")
+
+        with patch.object(
+            controller, "_fetch_message_from_folder", AsyncMock(side_effect=[(stale, None), (current, None)])
+        ), patch.object(controller, "_search_message_in_folder", AsyncMock(return_value=3)) as search:
+            result = await controller._get_message_from_folder(Mock(uuid="grant"), "<id@x>", "INBOX", uid=4)
+
+        search.assert_awaited_once()
+        assert result is not None
+        assert result.uid == 3
+        assert result.raw_message is current
+        connection_manager.release_connection.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_closes_connection_instead_of_pooling_it(self) -> None:
+        connection_manager = _make_connection_manager()
+        controller = MessageController(connection_manager)
+
+        with patch.object(controller, "_search_message_in_folder", AsyncMock(side_effect=TimeoutError)):
+            result = await controller._get_message_from_folder(Mock(uuid="grant"), "<id@x>", "INBOX")
+
+        assert result is None
+        connection_manager.close_connection.assert_awaited_once()
+        connection_manager.release_connection.assert_not_awaited()
+
+
+class TestFindMessage:
+    @pytest.mark.asyncio
+    async def test_searches_folders_with_earlier_hits_first(self) -> None:
+        controller = MessageController(_make_connection_manager())
+        account = Mock(uuid="grant")
+        found = Mock(message=Mock(folders=["Sent"]))
+
+        with patch(
+            "app.controllers.imap.message_controller.FolderUtils.get_account_folders",
+            AsyncMock(return_value=["INBOX", "Archive", "Sent"]),
+        ), patch.object(controller, "_search_folders", AsyncMock(return_value=found)) as search:
+            await controller._find_message(account, "<a@x>", None, None, True)
+            await controller._find_message(account, "<b@x>", None, None, True)
+            await controller._find_message(Mock(uuid="other"), "<c@x>", None, None, True)
+
+        assert [call.args[2] for call in search.call_args_list] == [
+            ["INBOX", "Archive", "Sent"],
+            ["Sent", "INBOX", "Archive"],
+            ["INBOX", "Archive", "Sent"],
+        ]
+
+
+class TestMessageCache:
+    @staticmethod
+    def _make_result(message_id: str = "<id@x>") -> MessageResult:
+        raw_message = FetchUtils.parse_message(f"Message-ID: {message_id}\r\n\r\nbody".encode())
+        return MessageResult(
+            message=MessageUtils.convert_to_nylas_format(raw_message, "grant", "INBOX"), raw_message=raw_message, uid=1
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeat_lookup_is_served_from_cache(self) -> None:
+        controller = MessageController(_make_connection_manager())
+        account = Mock(uuid="grant")
+
+        with patch.object(controller, "_find_message", AsyncMock(return_value=self._make_result())) as find:
+            first = await controller.get_message_by_id(account, "<id@x>")
+            assert first is not None
+            first.message.unread = False
+            second = await controller.get_message_by_id(account, "id@x")
+
+        find.assert_awaited_once()
+        assert second is not None
+        assert second.message.id == "<id@x>"
+        assert second.message.unread is True
+
+    @pytest.mark.asyncio
+    async def test_header_only_results_are_not_cached(self) -> None:
+        controller = MessageController(_make_connection_manager())
+        account = Mock(uuid="grant")
+
+        with patch.object(controller, "_find_message", AsyncMock(return_value=self._make_result())) as find:
+            await controller.get_message_by_id(account, "<id@x>", include_body=False)
+            await controller.get_message_by_id(account, "<id@x>")
+
+        assert find.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_and_evicted_entries_are_refetched(self) -> None:
+        controller = MessageController(_make_connection_manager())
+        account = Mock(uuid="grant")
+
+        with patch("app.controllers.imap.message_controller.MESSAGE_CACHE_SIZE", 1), patch.object(
+            controller, "_find_message", AsyncMock(side_effect=lambda *args: self._make_result(args[1]))
+        ) as find:
+            await controller.get_message_by_id(account, "<a@x>")
+            await controller.get_message_by_id(account, "<b@x>")
+            await controller.get_message_by_id(account, "<a@x>")
+            assert find.await_count == 3
+
+            controller._message_cache[("grant", "<a@x>")] = (0.0, controller._message_cache[("grant", "<a@x>")][1])
+            await controller.get_message_by_id(account, "<a@x>")
+            assert find.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_invalidation_drops_only_the_accounts_messages(self) -> None:
+        controller = MessageController(_make_connection_manager())
+        account, other_account = Mock(uuid="grant"), Mock(uuid="other")
+
+        with patch.object(controller, "_find_message", AsyncMock(return_value=self._make_result())) as find:
+            await controller.get_message_by_id(account, "<id@x>")
+            await controller.get_message_by_id(other_account, "<id@x>")
+            controller.invalidate_account_messages(account)
+            await controller.get_message_by_id(account, "<id@x>")
+            await controller.get_message_by_id(other_account, "<id@x>")
+
+        assert find.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_search(self) -> None:
+        controller = MessageController(_make_connection_manager())
+        account = Mock(uuid="grant")
+
+        async def find_message(*args: object) -> MessageResult:
+            await asyncio.sleep(0.01)
+            return self._make_result()
+
+        with patch.object(controller, "_find_message", AsyncMock(side_effect=find_message)) as find:
+            first, second = await asyncio.gather(
+                controller.get_message_by_id(account, "<id@x>"), controller.get_message_by_id(account, "id@x")
+            )
+
+        find.assert_awaited_once()
+        assert first is not None and second is not None
+        assert first.message == second.message
+        assert first.message is not second.message
+        assert controller._pending_lookups == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_lookup(self) -> None:
+        controller = MessageController(_make_connection_manager())
+        account = Mock(uuid="grant")
+
+        async def find_message(*args: object) -> MessageResult:
+            await asyncio.sleep(0.01)
+            return self._make_result()
+
+        with patch.object(controller, "_find_message", AsyncMock(side_effect=find_message)):
+            abandoned = asyncio.create_task(controller.get_message_by_id(account, "<id@x>"))
+            waiting = asyncio.create_task(controller.get_message_by_id(account, "<id@x>"))
+            await asyncio.sleep(0)
+            abandoned.cancel()
+            result = await waiting
+
+        assert result is not None
+        assert result.message.id == "<id@x>"
+
+
+class TestListMessages:
+    @staticmethod
+    def _make_controller(message_count: int) -> tuple[MessageController, Mock]:
+        connection_manager = _make_connection_manager()
+        uids = " ".join(str(uid) for uid in range(1, message_count + 1)).encode()
+        connection = Mock(search=AsyncMock(return_value=("OK", [uids])))
+        connection_manager.acquire_connection = AsyncMock(return_value=connection)
+        return MessageController(connection_manager), connection_manager
+
+    @staticmethod
+    async def _fetch_messages(connection: object, account: object, folder: str, uids: list[int]) -> list[object]:
+        await asyncio.sleep(0)
+        return [Mock(id=uid) for uid in uids]
+
+    @pytest.mark.asyncio
+    async def test_large_pages_are_fetched_over_parallel_connections_in_order(self) -> None:
+        controller, connection_manager = self._make_controller(200)
+
+        with patch.object(controller, "_fetch_messages", side_effect=self._fetch_messages) as fetch:
+            messages = await controller.list_messages(Mock(uuid="grant"), limit=100)
+
+        assert [message.id for message in messages] == list(range(1, 101))
+        assert [len(call.args[3]) for call in fetch.call_args_list] == [25, 25, 25, 25]
+        assert connection_manager.acquire_connection.await_count == 4
+        assert connection_manager.release_connection.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_small_pages_use_a_single_connection(self) -> None:
+        controller, connection_manager = self._make_controller(10)
+
+        with patch.object(controller, "_fetch_messages", side_effect=self._fetch_messages) as fetch:
+            messages = await controller.list_messages(Mock(uuid="grant"), limit=10)
+
+        assert len(messages) == 10
+        fetch.assert_called_once()
+        connection_manager.acquire_connection.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_is_retried_and_page_stays_in_order(self) -> None:
+        controller, connection_manager = self._make_controller(100)
+        failed: list[int] = []
+
+        async def fetch_messages(connection: object, account: object, folder: str, uids: list[int]) -> list[object]:
+            if uids[0] == 51 and not failed:
+                failed.append(uids[0])
+                raise TimeoutError
+            return await self._fetch_messages(connection, account, folder, uids)
+
+        with patch.object(controller, "_fetch_messages", side_effect=fetch_messages), patch.object(
+            controller._logger, "exception"
+        ) as log_exception:
+            messages = await controller.list_messages(Mock(uuid="grant"), limit=100)
+
+        assert [message.id for message in messages] == list(range(1, 101))
+        assert connection_manager.close_connection.await_count == 1
+        log_exception.assert_not_called()
+        assert connection_manager.acquire_connection.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_chunk_failing_twice_is_skipped_alone(self) -> None:
+        controller, _ = self._make_controller(100)
+
+        async def fetch_messages(connection: object, account: object, folder: str, uids: list[int]) -> list[object]:
+            if uids[0] == 51:
+                raise TimeoutError
+            return await self._fetch_messages(connection, account, folder, uids)
+
+        with patch.object(controller, "_fetch_messages", side_effect=fetch_messages):
+            messages = await controller.list_messages(Mock(uuid="grant"), limit=100)
+
+        assert [message.id for message in messages] == [*range(1, 51), *range(76, 101)]
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_chunk_is_refetched_and_its_connection_closed(self) -> None:
+        controller, connection_manager = self._make_controller(100)
+        failed: list[int] = []
+
+        async def fetch_messages(connection: object, account: object, folder: str, uids: list[int]) -> list[object]:
+            if uids[0] == 1 and not failed:
+                failed.append(uids[0])
+                raise TimeoutError
+            return await self._fetch_messages(connection, account, folder, uids)
+
+        with patch.object(controller, "_fetch_messages", side_effect=fetch_messages), patch.object(
+            controller._logger, "exception"
+        ) as log_exception:
+            messages = await controller.list_messages(Mock(uuid="grant"), limit=100)
+
+        assert [message.id for message in messages] == list(range(1, 101))
+        assert connection_manager.close_connection.await_count == 1
+        log_exception.assert_not_called()
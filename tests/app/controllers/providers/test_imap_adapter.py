@@ -0,0 +1,41 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.controllers.email.message import MessageResult
+from app.controllers.imap.fetch_utils import FetchUtils
+from app.controllers.providers.imap_adapter import ImapProviderAdapter
+from app.utils.message_utils import MessageUtils
+
+
+def _make_result() -> MessageResult:
+    raw_message = FetchUtils.parse_message(
+        b"Message-ID: <id@x>\r\nSubject: Hi\r\nContent-Type: text/plain\r\n\r\nHello there"
+    )
+    return MessageResult(
+        message=MessageUtils.convert_to_nylas_format(raw_message, "grant", "INBOX"), raw_message=raw_message, uid=3
+    )
+
+
+class TestUpdateMessageUnread:
+    @pytest.mark.asyncio
+    async def test_returns_the_full_message(self) -> None:
+        email_controller = Mock(get_message_by_id=AsyncMock(return_value=_make_result()))
+        connection = Mock(store=AsyncMock())
+
+        @asynccontextmanager
+        async def pooled_connection(account: object, folder: str | None = None) -> AsyncIterator[Mock]:
+            yield connection
+
+        adapter = ImapProviderAdapter(email_controller, Mock(pooled_connection=pooled_connection))
+
+        message = await adapter.update_message_unread(Mock(), "<id@x>", unread=True)
+
+        assert message is not None
+        assert message.body == "Hello there"
+        assert message.snippet == "Hello there"
+        assert message.unread is True
+        assert email_controller.get_message_by_id.await_args.kwargs.get("include_body", True) is True
+        connection.store.assert_awaited_once_with("3", "-FLAGS", r"(\Seen)")
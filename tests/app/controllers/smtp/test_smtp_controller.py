@@ -0,0 +1,127 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from email.mime.multipart import MIMEMultipart
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.api.payloads.messages import EmailAddress
+from app.controllers.smtp.smtp_controller import SMTPController, SMTPException, _SMTPConfig
+
+SMTP_CONFIG = _SMTPConfig(host="smtp.example.com", port=465)
+
+
+def _make_server() -> Mock:
+    server = Mock()
+    server.noop.return_value = (250, b"OK")
+    return server
+
+
+class TestSessionPool:
+    @pytest.fixture
+    def controller(self) -> SMTPController:
+        controller = SMTPController(Mock())
+        controller.login = AsyncMock(side_effect=lambda *args, **kwargs: _make_server())  # type: ignore[method-assign]
+        return controller
+
+    @staticmethod
+    async def _send(controller: SMTPController, account: Mock) -> None:
+        message = MIMEMultipart()
+        message["Message-ID"] = "<id@x>"
+        with patch("app.controllers.smtp.smtp_controller.PasswordUtils.decrypt_password", return_value="secret"):
+            await controller._send_smtp_message(
+                account, SMTP_CONFIG, message, b"raw", [EmailAddress(name="Bob", email="bob@example.com")]
+            )
+
+    @pytest.mark.asyncio
+    async def test_consecutive_sends_reuse_one_login(self, controller: SMTPController) -> None:
+        account = Mock(email="a@b.co")
+
+        await self._send(controller, account)
+        await self._send(controller, account)
+
+        controller.login.assert_awaited_once()  # type: ignore[attr-defined]
+        server = controller._idle_sessions[("a@b.co", "smtp.example.com", 465)][0].server
+        assert server.sendmail.call_count == 2
+        server.noop.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_dead_pooled_session_is_replaced(self, controller: SMTPController) -> None:
+        account = Mock(email="a@b.co")
+        await self._send(controller, account)
+        stale = controller._idle_sessions[("a@b.co", "smtp.example.com", 465)][0].server
+        stale.noop.side_effect = ConnectionResetError
+
+        await self._send(controller, account)
+
+        assert controller.login.await_count == 2  # type: ignore[attr-defined]
+        stale.sendmail.assert_called_once()
+        stale.quit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_send_closes_session_instead_of_pooling_it(self, controller: SMTPController) -> None:
+        account = Mock(email="a@b.co")
+        server = _make_server()
+        server.sendmail.side_effect = ConnectionResetError
+        controller.login = AsyncMock(return_value=server)  # type: ignore[method-assign]
+
+        with pytest.raises(SMTPException):
+            await self._send(controller, account)
+
+        server.quit.assert_called_once()
+        assert not controller._idle_sessions.get(("a@b.co", "smtp.example.com", 465))
+
+
+class TestSaveToSentFolder:
+    @staticmethod
+    def _make_controller(append_result: str) -> tuple[SMTPController, Mock]:
+        connection = Mock(append=AsyncMock(return_value=Mock(result=append_result)))
+
+        @asynccontextmanager
+        async def pooled_connection(account: object, folder: str | None = None) -> AsyncIterator[Mock]:
+            yield connection
+
+        return SMTPController(Mock(pooled_connection=pooled_connection)), connection
+
+    @pytest.mark.asyncio
+    async def test_appends_to_preferred_sent_folder(self) -> None:
+        controller, connection = self._make_controller("OK")
+
+        with patch(
+            "app.controllers.smtp.smtp_controller.FolderUtils.get_account_folders",
+            AsyncMock(return_value=["INBOX", "Sent Items", "Sent"]),
+        ):
+            assert await controller._save_to_sent_folder(Mock(), b"raw") == "Sent"
+
+        connection.append.assert_awaited_once_with(b"raw", "Sent", flags="\\Seen")
+
+    @pytest.mark.asyncio
+    async def test_rejected_append_invalidates_folder_cache(self) -> None:
+        controller, _ = self._make_controller("NO")
+
+        with patch(
+            "app.controllers.smtp.smtp_controller.FolderUtils.get_account_folders", AsyncMock(return_value=["Sent"])
+        ), patch("app.controllers.smtp.smtp_controller.FolderUtils.invalidate_account_folders") as invalidate:
+            assert await controller._save_to_sent_folder(Mock(), b"raw") is None
+
+        invalidate.assert_called_once()
+
+
+class TestSendEmail:
+    @pytest.mark.asyncio
+    async def test_sends_and_saves_the_same_serialized_message(self) -> None:
+        controller = SMTPController(Mock())
+        account = Mock(email="a@b.co", provider_context={"smtp_host": "smtp.example.com"})
+
+        with patch.object(controller, "_send_smtp_message", AsyncMock(return_value="<id@x>")) as send, patch.object(
+            controller, "_save_to_sent_folder", AsyncMock(return_value="Sent")
+        ) as save:
+            result = await controller.send_email(
+                account, [EmailAddress(name="Bob", email="bob@example.com")], "Hi", "<p>Hello</p>"
+            )
+
+        raw_message = send.await_args.args[3]
+        assert b"\r\nSubject: Hi\r\n" in raw_message
+        assert b"\n" not in raw_message.replace(b"\r\n", b"")
+        save.assert_awaited_once_with(account, raw_message)
+        assert result.folder == "Sent"
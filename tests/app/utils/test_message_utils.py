@@ -0,0 +1,229 @@
+from email import message_from_bytes
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import getaddresses
+from unittest.mock import patch
+
+import pytest
+
+from app.api.payloads.messages import Message
+from app.utils.message_utils import MessageUtils
+
+
+class TestDecodedPayloadSize:
+    @pytest.mark.parametrize("size", [0, 1, 2, 3, 57, 1000])
+    def test_base64_size_matches_decoded_length(self, size: int) -> None:
+        part = MIMEApplication(b"x" * size)
+
+        assert MessageUtils.decoded_payload_size(part) == size
+
+    def test_malformed_base64_falls_back_to_decoding(self) -> None:
+        part = MIMEApplication(b"")
+        part.set_payload("aGVsbG8")
+
+        assert MessageUtils.decoded_payload_size(part) == len(part.get_payload(decode=True))
+
+    @pytest.mark.parametrize("transfer_encoding", ["7bit", "8bit", "quoted-printable"])
+    def test_other_encodings_match_decoded_length(self, transfer_encoding: str) -> None:
+        part = MIMEText("", "plain", "us-ascii")
+        part.replace_header("Content-Transfer-Encoding", transfer_encoding)
+        part.set_payload("line one=3D\r\nline two caf\udcc3\udca9\r\n")
+
+        assert MessageUtils.decoded_payload_size(part) == len(part.get_payload(decode=True))
+
+    def test_ascii_identity_payload_is_not_decoded(self) -> None:
+        part = MIMEText("plain text", "plain", "us-ascii")
+
+        with patch.object(part, "get_payload", wraps=part.get_payload) as get_payload:
+            assert MessageUtils.decoded_payload_size(part) == len("plain text")
+
+        assert all(not call.kwargs.get("decode") for call in get_payload.call_args_list)
+
+    def test_non_base64_part_uses_decoded_length(self) -> None:
+        part = MIMEText("hello world", "plain", "utf-8")
+        part.replace_header("Content-Transfer-Encoding", "8bit")
+        part.set_payload("hello world")
+
+        assert MessageUtils.decoded_payload_size(part) == 11
+
+
+class TestExtractBodyAndAttachments:
+    def test_reports_decoded_attachment_size(self) -> None:
+        message = MIMEMultipart()
+        message.attach(MIMEText("body", "plain"))
+        attachment = MIMEApplication(b"\x00\x01" * 5000)
+        attachment.add_header("Content-Disposition", "attachment", filename="data.bin")
+        message.attach(attachment)
+
+        body, attachments = MessageUtils.extract_body_and_attachments(message)
+
+        assert body == "body"
+        assert [(a.id, a.filename, a.size) for a in attachments] == [("att_1", "data.bin", 10000)]
+
+    def test_prefers_html_over_earlier_plain_text(self) -> None:
+        message = MIMEMultipart("alternative")
+        message.attach(MIMEText("plain", "plain"))
+        message.attach(MIMEText("<p>html</p>", "html"))
+
+        body, attachments = MessageUtils.extract_body_and_attachments(message)
+
+        assert body == "<p>html</p>"
+        assert attachments == []
+
+    def test_skips_text_attachments_when_choosing_body(self) -> None:
+        message = MIMEMultipart()
+        attached_text = MIMEText("attached", "plain")
+        attached_text.add_header("Content-Disposition", "attachment", filename="notes.txt")
+        message.attach(attached_text)
+        message.attach(MIMEText("body", "plain"))
+
+        body, attachments = MessageUtils.extract_body_and_attachments(message)
+
+        assert body == "body"
+        assert [a.filename for a in attachments] == ["notes.txt"]
+
+    def test_single_part_message(self) -> None:
+        body, attachments = MessageUtils.extract_body_and_attachments(MIMEText("  hello  ", "plain"))
+
+        assert body == "hello"
+        assert attachments == []
+
+    def test_ascii_labelled_utf8_body_is_decoded_as_utf8(self) -> None:
+        message = MIMEText("", "plain", "us-ascii")
+        message.set_payload("caf\xc3\xa9".encode("latin-1").decode("ascii", "surrogateescape"))
+
+        body, _ = MessageUtils.extract_body_and_attachments(message)
+
+        assert body == "café"
+
+    def test_undecodable_bytes_are_replaced(self) -> None:
+        message = MIMEText("", "plain", "utf-8")
+        message.replace_header("Content-Transfer-Encoding", "8bit")
+        message.set_payload(b"ok \xff".decode("ascii", "surrogateescape"))
+
+        body, _ = MessageUtils.extract_body_and_attachments(message)
+
+        assert body == "ok \ufffd"
+
+
+class TestParseAddresses:
+    @pytest.mark.parametrize(
+        "header",
+        [
+            "John Doe <j@x.com>",
+            "j@x.com",
+            "John Doe <j@x.com>, Jane <jane@y.org>",
+            "John   Q.  Public <jqp@x.com>",
+            "John\r\n Doe <j@x.com>",
+            "  <a@b.co> ",
+            '"Doe, John" <j@x.com>',
+            "=?utf-8?q?J=C3=B6hn?= <j@x.com>",
+            "undisclosed-recipients:;",
+            "a@b.co,",
+        ],
+    )
+    def test_matches_getaddresses(self, header: str) -> None:
+        expected = [(name or addr, addr) for name, addr in getaddresses([header]) if addr]
+
+        addresses = MessageUtils.parse_addresses(header)
+
+        assert [(address.name, address.email) for address in addresses] == expected
+
+    def test_repeat_parses_return_independent_addresses(self) -> None:
+        header = '"Doe, John" <j@x.com>'
+        first = MessageUtils.parse_addresses(header)
+        first[0].name = "Changed"
+
+        assert MessageUtils.parse_addresses(header)[0].name == "Doe, John"
+
+
+class TestParseDate:
+    def test_parses_zoned_date(self) -> None:
+        assert MessageUtils.parse_date("Tue, 14 Oct 2025 09:12:33 +0200") == 1760425953
+
+    def test_zoneless_date_is_utc(self) -> None:
+        assert MessageUtils.parse_date("14 Oct 2025 09:12:33") == 1760433153
+
+    @pytest.mark.parametrize("date_header", ["", "not a date"])
+    def test_falls_back_to_now(self, date_header: str) -> None:
+        with patch("app.utils.message_utils.time.time", return_value=1700000000.5):
+            assert MessageUtils.parse_date(date_header) == 1700000000
+
+    def test_fallback_is_not_memoized(self) -> None:
+        with patch("app.utils.message_utils.time.time", return_value=1700000000.0):
+            MessageUtils.parse_date("not a date")
+        with patch("app.utils.message_utils.time.time", return_value=1800000000.0):
+            assert MessageUtils.parse_date("not a date") == 1800000000
+
+
+class TestGetHeader:
+    def test_plain_header_is_returned_as_is(self) -> None:
+        msg = message_from_bytes(b"Subject: Hello\r\n\r\n")
+
+        assert MessageUtils.get_header(msg, "Subject") == "Hello"
+        assert MessageUtils.get_header(msg, "To") == ""
+
+    def test_raw_utf8_headers_are_decoded(self) -> None:
+        msg = message_from_bytes("Subject: café\r\nFrom: Jö <jo@example.com>\r\nMessage-ID: <a@x>\r\n\r\nhi".encode())
+
+        message = MessageUtils.convert_to_nylas_format(msg, "grant", "INBOX")
+
+        assert message.subject == "café"
+        assert message.from_[0].name == "Jö"
+
+
+class TestParseReferences:
+    @pytest.mark.parametrize(
+        "header",
+        ["<a@x> <b@x>", "<a@x>\r\n <b@x>", "<a@x>,<b@x>", "<a@x><b@x>", "junk <a@x> (comment) <b@x>"],
+    )
+    def test_extracts_bracketed_ids(self, header: str) -> None:
+        msg = message_from_bytes(f"References: {header}\r\n\r\n".encode())
+
+        assert MessageUtils.parse_references(msg) == ["<a@x>", "<b@x>"]
+
+    def test_missing_header(self) -> None:
+        assert MessageUtils.parse_references(message_from_bytes(b"Subject: Hi\r\n\r\n")) == []
+
+    def test_falls_back_to_in_reply_to(self) -> None:
+        msg = message_from_bytes(b"In-Reply-To: <parent@x>\r\n\r\n")
+
+        assert MessageUtils.parse_references(msg) == ["<parent@x>"]
+
+    def test_references_take_precedence_over_in_reply_to(self) -> None:
+        msg = message_from_bytes(b"References: <root@x> <parent@x>\r\nIn-Reply-To: <parent@x>\r\n\r\n")
+
+        assert MessageUtils.parse_references(msg) == ["<root@x>", "<parent@x>"]
+
+
+class TestConvertToNylasFormat:
+    def test_matches_validated_model(self) -> None:
+        msg = MIMEMultipart()
+        msg["Subject"] = "Report"
+        msg["Message-ID"] = "<id@x>"
+        msg["From"] = "Ann <ann@example.com>"
+        msg["To"] = "bob@example.com"
+        msg["Date"] = "Mon, 13 Oct 2025 10:00:00 +0000"
+        msg.attach(MIMEText("hello", "plain"))
+        attachment = MIMEApplication(b"data")
+        attachment.add_header("Content-Disposition", "attachment", filename="a.bin")
+        msg.attach(attachment)
+
+        message = MessageUtils.convert_to_nylas_format(msg, "grant", "INBOX")
+
+        assert Message.model_validate(message.model_dump(by_alias=True)) == message
+        assert message.model_dump(by_alias=True)["from"] == [{"name": "Ann", "email": "ann@example.com"}]
+        assert message.to[0].name == "bob@example.com"
+        assert message.attachments[0].size == 4
+
+    @pytest.mark.parametrize(
+        ("flags", "unread", "starred"),
+        [(None, True, False), (frozenset(), True, False), (frozenset({"\\Seen", "\\Flagged"}), False, True)],
+    )
+    def test_flags_set_unread_and_starred(self, flags: frozenset[str] | None, unread: bool, starred: bool) -> None:
+        msg = message_from_bytes(b"Subject: Hi\r\n\r\nhi")
+
+        message = MessageUtils.convert_to_nylas_format(msg, "grant", "INBOX", flags)
+
+        assert (message.unread, message.starred) == (unread, starred)